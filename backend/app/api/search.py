@@ -1,23 +1,29 @@
-from fastapi import APIRouter, UploadFile, File, Form
+from fastapi import APIRouter, Depends, Request, UploadFile, File, Form
 from typing import Optional
 from backend.app.services.milvus_service_v2 import MilvusService
 from backend.app.services.kg_service import KGService
 from backend.app.services.reranker import rrf_fuse
+from backend.app.services.query_cache import QueryCache
+from backend.app.executors import run_milvus, run_kg
+from backend.app.dependencies import get_milvus, get_kg
 import asyncio
+import hashlib
 
 router = APIRouter()
 
-# Instantiate services (simple singletons for scaffold)
-milvus = MilvusService()
-kg = KGService()
+# Serialized responses for repeated identical requests (retries/regenerations)
+response_cache = QueryCache(max_size=1024, ttl_seconds=120)
 
 
 @router.post("/search")
 async def search(
+    request: Request,
     query: str = Form(...),
     image: Optional[UploadFile] = File(None),
     methods: Optional[str] = Form(None),
     topk: int = Form(5),
+    milvus: MilvusService = Depends(get_milvus),
+    kg: KGService = Depends(get_kg),
 ):
     """Search endpoint.
 
@@ -36,27 +42,45 @@ async def search(
     else:
         requested = {"fulltext", "semantic", "image", "kg", "fused"}
 
-    # Determine which milvus methods are requested
+    # Serve repeated requests from the response cache; the service generations
+    # change on insert, so writes invalidate cached responses.
+    image_hash = hashlib.blake2b(image_bytes or b"", digest_size=8).hexdigest()
+    cache_key = (milvus.generation, kg.generation, query, image_hash, frozenset(requested), topk)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    # Determine which milvus methods are requested; without an uploaded image the
+    # image modality is skipped entirely (no zero-vector ANN search)
     milvus_methods = {"fulltext", "semantic", "image"} & requested
+    if not image_bytes:
+        milvus_methods.discard("image")
 
     tasks = []
     milvus_task = None
     # If more than one milvus modality requested, use multi_vector_search to reduce overhead
     if len(milvus_methods) > 1:
-        milvus_task = asyncio.to_thread(milvus.multi_vector_search, query, image_bytes, topk)
+        milvus_task = run_milvus(request, milvus.multi_vector_search, query, image_bytes, topk)
         tasks.append(milvus_task)
     else:
         # call individual milvus methods only if requested
         if "fulltext" in milvus_methods:
-            tasks.append(asyncio.to_thread(milvus.search_fulltext, query, topk))
+            tasks.append(run_milvus(request, milvus.search_fulltext, query, topk))
         if "semantic" in milvus_methods:
-            tasks.append(asyncio.to_thread(milvus.search_semantic, query, topk))
+            tasks.append(run_milvus(request, milvus.search_semantic, query, topk))
         if "image" in milvus_methods:
-            tasks.append(asyncio.to_thread(milvus.search_image, image_bytes, topk))
+            tasks.append(run_milvus(request, milvus.search_image, image_bytes, topk))
+
+    # Fused ranking for the milvus modalities is computed server-side in one
+    # hybrid_search RPC; rrf_fuse is only used to merge it with KG results.
+    fused_task = None
+    if "fused" in requested:
+        fused_task = run_milvus(request, milvus.hybrid_search, query, image_bytes, topk)
+        tasks.append(fused_task)
 
     kg_task = None
     if "kg" in requested:
-        kg_task = asyncio.to_thread(kg.search_entities, query, topk)
+        kg_task = run_kg(request, kg.search_entities, query, topk)
         tasks.append(kg_task)
 
     # Run only the required tasks
@@ -79,6 +103,13 @@ async def search(
             if k in milvus_methods:
                 resp[k] = results[idx]
                 idx += 1
+    if "image" in requested:
+        resp.setdefault("image", [])
+
+    milvus_fused = []
+    if fused_task is not None:
+        milvus_fused = results[idx]
+        idx += 1
 
     # KG result
     if kg_task is not None:
@@ -86,11 +117,12 @@ async def search(
 
     # fused (RRF) - compute only if requested
     if "fused" in requested:
-        # prepare lists in fixed order expected by rrf_fuse
-        fulltext_res = resp.get("fulltext", [])
-        semantic_res = resp.get("semantic", [])
-        image_res = resp.get("image", [])
-        kg_res = resp.get("kg", [])
-        resp["fused"] = rrf_fuse([fulltext_res, semantic_res, image_res, kg_res])
+        resp["fused"] = rrf_fuse([milvus_fused, resp.get("kg", [])])
 
+    response_cache.set(cache_key, resp)
     return resp
+
+
+@router.get("/metrics")
+async def metrics():
+    return {"response_cache": response_cache.stats()}
@@ -1,33 +1,117 @@
-from fastapi import APIRouter, UploadFile, File, Form
-from typing import Optional
+from fastapi import APIRouter, Depends, Request, UploadFile, File, Form
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
 from backend.app.services.milvus_service_v2 import MilvusService
 from backend.app.services.kg_service import KGService
 from backend.app.services.reranker import rrf_fuse
+from backend.app.services.query_cache import QueryCache
+from backend.app.executors import run_milvus, run_kg
+from backend.app.dependencies import get_milvus, get_kg
 import asyncio
+import hashlib
+import orjson
 
 router = APIRouter()
 
-milvus = MilvusService()
-kg = KGService()
+# Serialized responses for repeated identical requests (retries/regenerations)
+response_cache = QueryCache(max_size=1024, ttl_seconds=120)
 
 
 @router.post("/search")
-async def search(query: str = Form(...), image: Optional[UploadFile] = File(None)):
+async def search(
+    request: Request,
+    query: str = Form(...),
+    image: Optional[UploadFile] = File(None),
+    milvus: MilvusService = Depends(get_milvus),
+    kg: KGService = Depends(get_kg),
+):
     image_bytes = None
     if image:
         image_bytes = await image.read()
 
+    # Serve repeated requests from the response cache; the service generations
+    # change on insert, so writes invalidate cached responses.
+    image_hash = hashlib.blake2b(image_bytes or b"", digest_size=8).hexdigest()
+    cache_key = (milvus.generation, kg.generation, query, image_hash)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     # Run milvus hybrid search in thread
-    milvus_task = asyncio.to_thread(milvus.hybrid_search, query, image_bytes, 10)
-    kg_task = asyncio.to_thread(kg.search_entities, query)
+    milvus_task = run_milvus(request, milvus.hybrid_search, query, image_bytes, 10)
+    kg_task = run_kg(request, kg.search_entities, query)
 
     milvus_res, kg_res = await asyncio.gather(milvus_task, kg_task)
 
     # Fuse milvus results with KG using RRF
     fused = rrf_fuse([milvus_res, kg_res])
 
-    return {
+    resp = {
         "milvus": milvus_res,
         "kg": kg_res,
         "fused": fused,
     }
+    response_cache.set(cache_key, resp)
+    return resp
+
+
+@router.post("/search/stream")
+async def search_stream(
+    request: Request,
+    query: str = Form(...),
+    image: Optional[UploadFile] = File(None),
+    milvus: MilvusService = Depends(get_milvus),
+    kg: KGService = Depends(get_kg),
+):
+    """NDJSON variant of /search.
+
+    Writes `{"milvus": ...}` and `{"kg": ...}` lines as soon as each search
+    finishes, then a final `{"fused": ...}` line.
+    """
+    image_bytes = None
+    if image:
+        image_bytes = await image.read()
+
+    async def _named(name, coro):
+        return name, await coro
+
+    async def _lines():
+        results = {}
+        for fut in asyncio.as_completed([
+            _named("milvus", run_milvus(request, milvus.hybrid_search, query, image_bytes, 10)),
+            _named("kg", run_kg(request, kg.search_entities, query)),
+        ]):
+            name, res = await fut
+            results[name] = res
+            yield orjson.dumps({name: res}) + b"\n"
+        yield orjson.dumps({"fused": rrf_fuse([results["milvus"], results["kg"]])}) + b"\n"
+
+    return StreamingResponse(_lines(), media_type="application/x-ndjson")
+
+
+@router.post("/batch_search")
+async def batch_search(
+    request: Request,
+    queries: List[str] = Form(...),
+    images: Optional[List[UploadFile]] = File(None),
+    topk: int = Form(10),
+    milvus: MilvusService = Depends(get_milvus),
+):
+    """Search N sub-queries in one request.
+
+    `images[i]` (optional) belongs to `queries[i]`. All queries are encoded in one
+    batch and each modality is a single multi-vector Milvus search.
+    """
+    image_bytes = [await img.read() for img in images] if images else []
+
+    milvus_res = await run_milvus(request, milvus.batch_search, queries, image_bytes, topk)
+
+    results = []
+    for r in milvus_res:
+        results.append({**r, "fused": rrf_fuse([r["fulltext"], r["semantic"], r["image"]])})
+    return {"results": results}
+
+
+@router.get("/metrics")
+async def metrics():
+    return {"response_cache": response_cache.stats()}
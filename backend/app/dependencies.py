@@ -0,0 +1,85 @@
+"""
+Shared service instances for the API.
+
+The embedding model and the Milvus / KG services are created once per worker
+process in the app lifespan (not at import time), and handed to the route
+handlers as FastAPI dependencies.
+"""
+import logging
+import os
+from functools import lru_cache
+
+import torch
+from fastapi import FastAPI, Request
+from sentence_transformers import SentenceTransformer
+
+from backend.app.services.milvus_service_v2 import MilvusService
+from backend.app.services.kg_service import KGService
+from backend.app.services.onnx_encoder import OnnxTextEncoder
+from backend.app.services.reranker import rrf_fuse
+
+logger = logging.getLogger(__name__)
+
+TEXT_MODEL_NAME = "all-MiniLM-L6-v2"
+
+
+@lru_cache(maxsize=1)
+def load_text_model():
+    # Only loads the weights: under Gunicorn's preload_app this runs in the master,
+    # and running torch compute there would start intra-op thread pools that are
+    # not fork-safe. `warmup_text_model` does the rest in each worker.
+    # EMB_ONNX_PATH points at an int8 model from `onnx_encoder.export_quantized()`;
+    # keep the FP32 SentenceTransformer when it's unset or can't be loaded.
+    model = None
+    onnx_path = os.getenv("EMB_ONNX_PATH")
+    if onnx_path:
+        try:
+            model = OnnxTextEncoder(onnx_path)
+            logger.info(f"Using quantized ONNX text encoder from {onnx_path}")
+        except Exception as e:
+            logger.warning(f"Failed to load ONNX text encoder ({e}); falling back to FP32")
+    if model is None:
+        model = SentenceTransformer(TEXT_MODEL_NAME, device=os.getenv("EMB_DEVICE", "cpu"))
+    return model
+
+
+def warmup_text_model(model):
+    """Size this worker's torch thread pool and run a first encode, so the first
+    request doesn't pay the lazy init / first-batch cost. Call after fork."""
+    # With several uvicorn workers per host, TORCH_NUM_THREADS=1 avoids
+    # oversubscribing the CPU with one torch thread pool per worker.
+    num_threads = os.getenv("TORCH_NUM_THREADS")
+    if num_threads:
+        torch.set_num_threads(int(num_threads))
+    model.encode(["warmup"] * 8, batch_size=8)
+
+
+def init_services(app: FastAPI):
+    """Load the model and create the services on `app.state`; call from the app lifespan."""
+    logger.info(f"Loading text model {TEXT_MODEL_NAME}...")
+    app.state.text_model = load_text_model()
+    warmup_text_model(app.state.text_model)
+    app.state.milvus = MilvusService(text_model=app.state.text_model)
+    app.state.kg = KGService()
+    if os.getenv("WARMUP", "true").lower() == "true":
+        warmup_services(app)
+
+
+def warmup_services(app: FastAPI):
+    """Run one throwaway search so the first real request doesn't pay the collection
+    load, the first query encode or the numba compile of the RRF kernel."""
+    logger.info("Warming up search services...")
+    try:
+        app.state.milvus.search_semantic("warmup", topk=1)
+    except Exception as e:
+        logger.warning(f"Milvus warmup search failed: {e}")
+    # Large enough to take the compiled (numba) fusion path
+    rrf_fuse([[(i, 0.0, "warmup") for i in range(64)]])
+
+
+def get_milvus(request: Request) -> MilvusService:
+    return request.app.state.milvus
+
+
+def get_kg(request: Request) -> KGService:
+    return request.app.state.kg
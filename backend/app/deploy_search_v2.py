@@ -1,9 +1,13 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 import uvicorn
 import os
 import logging
 from backend.app.api import search_v2
+from backend.app.executors import init_executors, shutdown_executors
+from backend.app.dependencies import init_services, load_text_model
+from backend.app.profiling import install_worker_profiler
 
 
 # Configure logging
@@ -18,24 +22,39 @@ async def lifespan(app: FastAPI):
     """
     logger.info("Starting up search_v2 service...")
     
-    # Initialize services here if needed
-    # For example, connecting to databases, loading models, etc.
+    # Opt-in per-worker profiling (set by start_search_v2 --profile)
+    if os.getenv("PROFILE_DIR"):
+        install_worker_profiler(os.getenv("PROFILE_DIR"))
+    
+    # Dedicated thread pools for blocking Milvus / Neo4j calls
+    init_executors(app)
+    # Load the embedding model once per worker and create the shared services
+    init_services(app)
     
     yield
     
     # Cleanup on shutdown
     logger.info("Shutting down search_v2 service...")
+    shutdown_executors(app)
 
 
 def create_app():
     """
     Create and configure FastAPI application
     """
+    # Load the embedding weights up front: under Gunicorn with preload_app the master
+    # loads them once and workers share them copy-on-write. The warmup encode,
+    # Milvus/Neo4j clients and thread pools are set up per worker in the lifespan
+    # (neither connections nor torch's thread pools survive fork).
+    load_text_model()
+    
     app = FastAPI(
         title="RAG Graph Search Service v2",
         description="Multi-modal search service with semantic, full-text, image and knowledge graph capabilities",
         version="2.0.0",
-        lifespan=lifespan
+        lifespan=lifespan,
+        # orjson serializes the large result lists much faster than stdlib json
+        default_response_class=ORJSONResponse
     )
     
     # Include the search router
@@ -0,0 +1,39 @@
+"""
+Dedicated worker pools for the blocking Milvus and Neo4j clients.
+
+The search handlers offload blocking calls to these sized pools instead of
+`asyncio.to_thread`, so they don't compete with FastAPI's shared threadpool
+and a semaphore bounds how many calls can be in flight at once.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import os
+
+from fastapi import FastAPI, Request
+
+
+def init_executors(app: FastAPI):
+    """Create the pools and semaphores on `app.state`; call from the app lifespan."""
+    milvus_workers = int(os.getenv("MILVUS_WORKERS", 8))
+    kg_workers = int(os.getenv("KG_WORKERS", 4))
+    app.state.milvus_pool = ThreadPoolExecutor(max_workers=milvus_workers, thread_name_prefix="milvus")
+    app.state.kg_pool = ThreadPoolExecutor(max_workers=kg_workers, thread_name_prefix="kg")
+    app.state.milvus_sem = asyncio.Semaphore(milvus_workers)
+    app.state.kg_sem = asyncio.Semaphore(kg_workers)
+
+
+def shutdown_executors(app: FastAPI):
+    app.state.milvus_pool.shutdown(wait=False, cancel_futures=True)
+    app.state.kg_pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def run_milvus(request: Request, fn, *args):
+    state = request.app.state
+    async with state.milvus_sem:
+        return await asyncio.get_running_loop().run_in_executor(state.milvus_pool, fn, *args)
+
+
+async def run_kg(request: Request, fn, *args):
+    state = request.app.state
+    async with state.kg_sem:
+        return await asyncio.get_running_loop().run_in_executor(state.kg_pool, fn, *args)
@@ -1,8 +1,21 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from contextlib import asynccontextmanager
 
 from backend.app.api import search_v2 as search_api
+from backend.app.executors import init_executors, shutdown_executors
+from backend.app.dependencies import init_services
 
-app = FastAPI(title="RAG Graph Service")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    init_executors(app)
+    init_services(app)
+    yield
+    shutdown_executors(app)
+
+
+app = FastAPI(title="RAG Graph Service", lifespan=lifespan, default_response_class=ORJSONResponse)
 
 app.include_router(search_api.router, prefix="/api")
 
@@ -0,0 +1,95 @@
+"""
+Opt-in per-worker cProfile for the search service.
+
+Each worker profiles every thread from startup (the event loop and the executor
+threads the blocking Milvus/Neo4j calls run on) and writes the merged stats to
+`<profile_dir>/worker-<pid>.pstats` whenever it receives SIGUSR2, so a running
+multi-worker deployment can be sampled with `kill -USR2 <pid>`.
+"""
+from contextlib import contextmanager
+from typing import Optional
+import cProfile
+import logging
+import os
+import pstats
+import shutil
+import signal
+import sys
+import threading
+
+logger = logging.getLogger(__name__)
+
+_profilers = []
+_profilers_lock = threading.Lock()
+
+
+class _Snapshot:
+    # Lets pstats read a running profiler without disabling it (create_stats would)
+    def __init__(self, prof: cProfile.Profile):
+        self.prof = prof
+
+    def create_stats(self):
+        self.prof.snapshot_stats()
+        self.stats = self.prof.stats
+
+
+def _start_profiler():
+    prof = cProfile.Profile()
+    with _profilers_lock:
+        _profilers.append(prof)
+    prof.enable()
+
+
+def _start_thread_profiler(frame, event, arg):
+    # threading.setprofile hook: runs once in each new thread, then the thread's
+    # own profiler replaces it
+    _start_profiler()
+
+
+def install_worker_profiler(profile_dir: str):
+    if not hasattr(signal, "SIGUSR2"):
+        logger.warning("SIGUSR2 is not available on this platform; profiling disabled")
+        return
+    os.makedirs(profile_dir, exist_ok=True)
+    path = os.path.join(profile_dir, f"worker-{os.getpid()}.pstats")
+
+    def dump(signum, frame):
+        with _profilers_lock:
+            snapshots = [_Snapshot(p) for p in _profilers]
+        pstats.Stats(*snapshots).dump_stats(path)
+        logger.info(f"Profile written to {path}")
+
+    signal.signal(signal.SIGUSR2, dump)
+    # From 3.12 cProfile hooks sys.monitoring, which is process-wide: one profiler
+    # sees every thread. Before that a profiler only sees the thread that enabled
+    # it, so each thread started from here on enables its own.
+    if sys.version_info < (3, 12):
+        threading.setprofile(_start_thread_profiler)
+    _start_profiler()
+    logger.info(f"Profiling worker {os.getpid()}; send SIGUSR2 to write {path}")
+
+
+@contextmanager
+def profiled(path: Optional[str]):
+    """cProfile the block and write the stats to `path`; a no-op when `path` is None."""
+    if not path:
+        yield
+        return
+    prof = cProfile.Profile()
+    prof.enable()
+    try:
+        yield
+    finally:
+        prof.disable()
+        prof.dump_stats(path)
+        print(f"Profile written to {path} (inspect with `python -m pstats {path}`)")
+
+
+def reexec_under_py_spy(output: str):
+    """Replace this process with `py-spy record` running the same command line
+    (minus `--py-spy`), writing a flame graph to `output`."""
+    py_spy = shutil.which("py-spy")
+    if py_spy is None:
+        raise SystemExit("py-spy not found; install it with `pip install py-spy`")
+    argv = [a for a in sys.argv if a != "--py-spy"]
+    os.execv(py_spy, [py_spy, "record", "-o", output, "--", sys.executable, *argv])
@@ -0,0 +1,114 @@
+"""
+Top-k selection over dense BM25 score arrays.
+
+With numba installed the selection is a compiled bounded min-heap (one pass, no
+full sort); otherwise it falls back to NumPy's argpartition. 1-D and 2-D inputs
+have separate kernels so each one is compiled for a single array type. Both
+backends break ties by document position, so they return identical indices.
+"""
+import numpy as np
+
+try:
+    from numba import njit, prange
+except Exception:
+    njit = None
+
+BACKENDS = ("auto", "numpy", "numba")
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _worse(s1, i1, s2, i2):
+        # Heap order: lower score first, and among equal scores the later document
+        return s1 < s2 or (s1 == s2 and i1 > i2)
+
+    @njit(cache=True)
+    def _heap_topk_1d(scores, k):
+        # Bounded min-heap of the k best (score, position) pairs seen so far;
+        # heap_s[0] is the worst. Documents arrive in position order, so a new one
+        # that only ties the worst never displaces it.
+        heap_s = np.empty(k, dtype=np.float64)
+        heap_i = np.empty(k, dtype=np.int64)
+        size = 0
+        for i in range(scores.shape[0]):
+            s = scores[i]
+            if size < k:
+                j = size
+                size += 1
+                while j > 0:
+                    p = (j - 1) // 2
+                    if not _worse(s, i, heap_s[p], heap_i[p]):
+                        break
+                    heap_s[j] = heap_s[p]
+                    heap_i[j] = heap_i[p]
+                    j = p
+                heap_s[j] = s
+                heap_i[j] = i
+            elif s > heap_s[0]:
+                j = 0
+                while True:
+                    c = 2 * j + 1
+                    if c >= k:
+                        break
+                    if c + 1 < k and _worse(heap_s[c + 1], heap_i[c + 1], heap_s[c], heap_i[c]):
+                        c += 1
+                    if not _worse(heap_s[c], heap_i[c], s, i):
+                        break
+                    heap_s[j] = heap_s[c]
+                    heap_i[j] = heap_i[c]
+                    j = c
+                heap_s[j] = s
+                heap_i[j] = i
+        return heap_i
+
+    @njit(cache=True, parallel=True)
+    def _heap_topk_2d(scores, k):
+        out = np.empty((scores.shape[0], k), dtype=np.int64)
+        for q in prange(scores.shape[0]):
+            out[q] = _heap_topk_1d(scores[q], k)
+        return out
+else:
+    _heap_topk_1d = None
+    _heap_topk_2d = None
+
+
+def _use_numba(backend: str) -> bool:
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown top-k backend {backend!r}; expected one of {BACKENDS}")
+    if backend == "numba" and _heap_topk_1d is None:
+        raise ImportError("numba is not installed")
+    return backend != "numpy" and _heap_topk_1d is not None
+
+
+def _sort_desc(scores: np.ndarray, idx: np.ndarray) -> np.ndarray:
+    # Highest score first, ties broken by document position
+    order = np.lexsort((idx, -np.take_along_axis(scores, idx, axis=-1)), axis=-1)
+    return np.take_along_axis(idx, order, axis=-1)
+
+
+def _partition_topk_1d(scores: np.ndarray, k: int) -> np.ndarray:
+    # argpartition picks arbitrarily among scores tied with the k-th; keep every
+    # candidate at or above it and let the sort cut by position instead
+    kth = -np.partition(-scores, k - 1)[k - 1]
+    idx = np.flatnonzero(scores >= kth)
+    return _sort_desc(scores, idx)[:k]
+
+
+def topk_1d(scores: np.ndarray, k: int, backend: str = "auto") -> np.ndarray:
+    """Indices of the `k` highest scores, best first; ties go to the lower index."""
+    k = min(k, scores.shape[0])
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    if _use_numba(backend):
+        return _sort_desc(scores, _heap_topk_1d(scores, k))
+    return _partition_topk_1d(scores, k)
+
+
+def topk_2d(scores: np.ndarray, k: int, backend: str = "auto") -> np.ndarray:
+    """Row-wise `topk_1d` for an (n_queries, n_docs) score matrix."""
+    k = min(k, scores.shape[1])
+    if k <= 0:
+        return np.empty((scores.shape[0], 0), dtype=np.int64)
+    if _use_numba(backend):
+        return _sort_desc(scores, _heap_topk_2d(np.ascontiguousarray(scores), k))
+    return np.stack([_partition_topk_1d(row, k) for row in scores])
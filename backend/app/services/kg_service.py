@@ -6,11 +6,14 @@ constructor), KG operations will be executed against Neo4j instead.
 
 Implemented features:
 - `kg_insert_nodes_edges(nodes, edges)` to insert/merge nodes and relationships into Neo4j.
-- `search_entities(query, topk)` to search node `text` and `label` properties in Neo4j.
+- `search_entities(query, topk)` to search node `text` and `label` properties via a Neo4j full-text index.
 - `expand_neighbors(node_id, hops)` to get neighbors up to `hops` deep (Neo4j or NetworkX).
 """
 
+import re
 import networkx as nx
+from collections import defaultdict
+from itertools import islice
 from typing import List, Tuple, Optional, Dict, Any
 
 try:
@@ -19,16 +22,66 @@ except Exception:
     GraphDatabase = None
 
 
+def _ngrams(s: str) -> set:
+    # Character unigrams + bigrams: works for CJK text (no word boundaries) and
+    # for partial-word queries, which a word-token index would miss.
+    return set(s) | {s[i:i + 2] for i in range(len(s) - 1)}
+
+
+def _query_grams(q: str) -> set:
+    # Every node whose text contains `q` contains all of q's bigrams
+    return {q[i:i + 2] for i in range(len(q) - 1)} if len(q) > 1 else set(q)
+
+
+_LUCENE_SPECIAL = re.compile(r'([+\-!(){}\[\]^"~*?:\\/&|])')
+
+
+def _escape_lucene(q: str) -> str:
+    # Treat the user query as plain text rather than Lucene query syntax
+    return _LUCENE_SPECIAL.sub(r"\\\1", q)
+
+
+# Rows per `UNWIND` write transaction in `kg_insert_nodes_edges`
+_WRITE_BATCH_SIZE = 1000
+# Upper bound for `expand_neighbors`; path enumeration grows exponentially with depth
+_MAX_HOPS = 5
+
+
+def _batched(rows: list, size: int):
+    it = iter(rows)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def _quote_name(name: str) -> str:
+    # Labels / relationship types can't be query parameters; backtick-quote them
+    return "`" + name.replace("`", "``") + "`"
+
+
 class KGService:
     def __init__(self, neo4j_uri: Optional[str] = None, user: Optional[str] = None, password: Optional[str] = None):
         self.G = nx.Graph()
+        # In-memory n-gram index over lowercased `text`/`label` for the NetworkX
+        # fallback, maintained at mutation time so searches skip the full scan.
+        self._gram_index: Dict[str, set] = defaultdict(set)
+        self._node_grams: Dict[Any, set] = {}
+        self._lower_cache: Dict[Any, Tuple[str, str]] = {}
+        self._node_seq: Dict[Any, int] = {}
+        # Bumped on every insert so callers can invalidate cached search results
+        self._generation = 0
         self._build_sample()
 
         # Neo4j driver (optional)
         self.driver = None
+        self._has_apoc = False
         if neo4j_uri and GraphDatabase is not None:
             self.connect_neo4j(neo4j_uri, user, password)
 
+    @property
+    def generation(self) -> int:
+        """Counter bumped on every insert; include it in result cache keys."""
+        return self._generation
+
     def _build_sample(self):
         # Small example graph for local fallback
         self.G.add_node(1, label="Document 1", text="关于产品A的说明")
@@ -36,12 +89,64 @@ class KGService:
         self.G.add_node(3, label="Company", text="公司简介")
         self.G.add_edge(1, 3, relation="belongs_to")
         self.G.add_edge(2, 3, relation="belongs_to")
+        for n in self.G.nodes:
+            self._index_node(n)
+
+    def _index_node(self, n):
+        """(Re)index node `n` for `search_entities` on the NetworkX fallback."""
+        d = self.G.nodes[n]
+        fields = ((d.get("text", "") or "").lower(), (d.get("label", "") or "").lower())
+        for g in self._node_grams.pop(n, ()):
+            self._gram_index[g].discard(n)
+        grams = _ngrams(fields[0]) | _ngrams(fields[1])
+        for g in grams:
+            self._gram_index[g].add(n)
+        self._node_grams[n] = grams
+        self._lower_cache[n] = fields
+        self._node_seq.setdefault(n, len(self._node_seq))
+
+    @staticmethod
+    def build_subgraph(docs: List[Dict[str, Any]]) -> nx.Graph:
+        """Build the KG fragment for `docs`: one `doc:<id>` node per document.
+
+        Depends only on its input, so shards of a corpus can be built in worker
+        processes and merged with `add_subgraphs`. The prefix keeps document nodes
+        from overwriting existing nodes with the same integer id.
+        """
+        g = nx.Graph()
+        for d in docs:
+            g.add_node(f"doc:{d.get('id')}", label=f"Document {d.get('id')}", text=d.get("text", ""))
+        return g
+
+    def add_subgraphs(self, subgraphs: List[nx.Graph]):
+        """Merge subgraphs into the in-memory graph (later attributes win) and index them."""
+        self._generation += 1
+        self.G = nx.compose_all([self.G, *subgraphs])
+        for g in subgraphs:
+            for n in g.nodes:
+                self._index_node(n)
 
     def connect_neo4j(self, uri: str, user: str, password: str):
         """Connect to a Neo4j instance using the official driver."""
         if GraphDatabase is None:
             raise RuntimeError("neo4j driver not installed; add 'neo4j' to requirements.txt")
         self.driver = GraphDatabase.driver(uri, auth=basic_auth(user, password))
+        self.ensure_indexes()
+
+    def ensure_indexes(self):
+        """Create the Neo4j indexes used by the KG queries (idempotent).
+
+        All inserted nodes carry the `Entity` label so a single full-text index
+        over `text`/`label` serves `search_entities`.
+        """
+        with self.driver.session() as session:
+            session.run("CREATE FULLTEXT INDEX nodeText IF NOT EXISTS FOR (n:Entity) ON EACH [n.text, n.label]")
+            # Unique `kg_id` (backed by an index) makes every anchor/endpoint lookup O(1)
+            session.run("CREATE CONSTRAINT kg_id_unique IF NOT EXISTS FOR (n:Entity) REQUIRE n.kg_id IS UNIQUE")
+            rec = session.run(
+                "SHOW PROCEDURES YIELD name WHERE name = 'apoc.merge.relationship' RETURN count(*) > 0 AS ok"
+            ).single()
+            self._has_apoc = bool(rec and rec["ok"])
 
     def close(self):
         if self.driver:
@@ -56,6 +161,7 @@ class KGService:
         Uses MERGE semantics so repeated runs are idempotent.
         If Neo4j is not connected, falls back to updating the in-memory NetworkX graph.
         """
+        self._generation += 1
         if not self.driver:
             # Fallback: update NetworkX
             for n in nodes:
@@ -63,33 +169,56 @@ class KGService:
                 props = n.get("props", {})
                 label = ",".join(n.get("labels", [])) or None
                 self.G.add_node(nid, label=label, **props)
+                self._index_node(nid)
             for e in edges:
                 self.G.add_edge(e.get("from"), e.get("to"), **e.get("props", {}), relation=e.get("rel"))
             return
 
-        def _create(tx, node):
-            labels = ":".join(node.get("labels", [])) or ""
-            props = node.get("props", {})
-            # ensure unique identifier property `kg_id` if provided, otherwise use `id` value
-            kg_id = node.get("id")
-            props_with_id = {**props, "kg_id": kg_id}
-            props_str = ", ".join([f"{k}: $props.{k}" for k in props_with_id.keys()])
-            cypher = f"MERGE (n:{labels} {{kg_id: $kg_id}}) SET n += $props"
-            tx.run(cypher, kg_id=kg_id, props=props)
+        # Group nodes by label set and edges by relationship type so each group is
+        # written with one constant `UNWIND` query per batch instead of one
+        # transaction (and one round-trip) per node/edge.
+        node_groups: Dict[tuple, list] = defaultdict(list)
+        for node in nodes:
+            labels = tuple(node.get("labels", []))
+            # `kg_id` is the unique identifier property, taken from the node `id`
+            node_groups[labels].append({"kg_id": node.get("id"), "props": node.get("props", {})})
 
-        with self.driver.session() as session:
-            for node in nodes:
-                session.write_transaction(_create, node)
+        edge_groups: Dict[str, list] = defaultdict(list)
+        for e in edges:
+            # With APOC the relationship type is a parameter, so one group suffices
+            key = None if self._has_apoc else e.get("rel", "RELATED")
+            edge_groups[key].append(
+                {"from": e.get("from"), "to": e.get("to"), "rel": e.get("rel", "RELATED"), "props": e.get("props", {})}
+            )
 
-            def _create_rel(tx, e):
-                cy = (
-                    "MATCH (a {kg_id: $from_id}), (b {kg_id: $to_id}) "
-                    "MERGE (a)-[r:" + e.get("rel", "RELATED") + "]->(b) SET r += $props"
+        with self.driver.session() as session:
+            for labels, rows in node_groups.items():
+                # MERGE on the constrained `Entity.kg_id` only, then add the other labels
+                set_labels = "n:" + ":".join(_quote_name(l) for l in labels) + ", " if labels else ""
+                cypher = (
+                    "UNWIND $rows AS row "
+                    "MERGE (n:Entity {kg_id: row.kg_id}) "
+                    "SET " + set_labels + "n += row.props"
                 )
-                tx.run(cy, from_id=e.get("from"), to_id=e.get("to"), props=e.get("props", {}))
+                for batch in _batched(rows, _WRITE_BATCH_SIZE):
+                    session.execute_write(lambda tx: tx.run(cypher, rows=batch).consume())
 
-            for e in edges:
-                session.write_transaction(_create_rel, e)
+            for rel, rows in edge_groups.items():
+                if rel is None:
+                    cypher = (
+                        "UNWIND $rows AS r "
+                        "MATCH (a:Entity {kg_id: r.from}), (b:Entity {kg_id: r.to}) "
+                        "CALL apoc.merge.relationship(a, r.rel, {}, r.props, b, r.props) YIELD rel "
+                        "RETURN count(rel)"
+                    )
+                else:
+                    cypher = (
+                        "UNWIND $rows AS r "
+                        "MATCH (a:Entity {kg_id: r.from}), (b:Entity {kg_id: r.to}) "
+                        "MERGE (a)-[e:" + _quote_name(rel) + "]->(b) SET e += r.props"
+                    )
+                for batch in _batched(rows, _WRITE_BATCH_SIZE):
+                    session.execute_write(lambda tx: tx.run(cypher, rows=batch).consume())
 
     def search_entities(self, query: str, topk: int = 10) -> List[Tuple[int, float, str]]:
         """Search entities by `text` or `label` property.
@@ -98,35 +227,63 @@ class KGService:
         """
         results = []
         if not self.driver:
-            # simple NetworkX match
-            for n, d in self.G.nodes(data=True):
-                txt = d.get("text", "") or ""
-                lbl = d.get("label", "") or ""
-                if query.lower() in txt.lower() or query.lower() in lbl.lower():
-                    results.append((n, 1.0, "kg"))
-            return results[:topk]
+            # NetworkX match: prefilter candidates via the n-gram index, then verify
+            # the substring match on that (small) candidate set only
+            q = query.lower()
+            grams = _query_grams(q)
+            if grams:
+                postings = sorted((self._gram_index.get(g, set()) for g in grams), key=len)
+                candidates = sorted(set.intersection(*postings), key=self._node_seq.get)
+            else:
+                candidates = list(self.G.nodes)
+            matches = (n for n in candidates if any(q in f for f in self._lower_cache.get(n, ("", ""))))
+            return [(n, 1.0, "kg") for n in islice(matches, topk)]
 
+        if not query.strip():
+            return results
+
+        # Full-text index lookup instead of a `toLower(...) CONTAINS` scan over every
+        # node; the Lucene score is kept so RRF sees a real ranking.
         cypher = (
-            "MATCH (n) WHERE (exists(n.text) AND toLower(n.text) CONTAINS toLower($q))"
-            " OR (exists(n.label) AND toLower(n.label) CONTAINS toLower($q)) "
-            "RETURN n.kg_id as kg_id, n.text as text LIMIT $limit"
+            "CALL db.index.fulltext.queryNodes('nodeText', $q) YIELD node, score "
+            "RETURN node.kg_id as kg_id, score ORDER BY score DESC LIMIT $limit"
         )
+        seen = set()
         with self.driver.session() as session:
-            res = session.run(cypher, q=query, limit=topk)
+            res = session.run(cypher, q=_escape_lucene(query), limit=topk)
             for r in res:
                 kg_id = r.get("kg_id")
-                results.append((kg_id, 1.0, "kg"))
+                if kg_id in seen:
+                    continue
+                seen.add(kg_id)
+                results.append((kg_id, float(r.get("score")), "kg"))
         return results
 
     def expand_neighbors(self, node_id: int, hops: int = 1) -> List[Any]:
+        hops = int(hops)
+        if hops > _MAX_HOPS:
+            raise ValueError(f"hops must be at most {_MAX_HOPS}, got {hops}")
         if not self.driver:
             return list(nx.single_source_shortest_path_length(self.G, node_id, cutoff=hops).keys())
 
-        # Use kg_id property to find node
-        cy = (
-            "MATCH (s {kg_id: $kgid})-[*1..$hops]-(m) "
-            "RETURN DISTINCT m.kg_id as kg_id LIMIT 1000"
-        )
+        if hops < 1:
+            return []
+
+        # Use kg_id property (uniquely indexed on Entity) to find the anchor node
+        if self._has_apoc:
+            # BFS expansion that visits each node once, unlike path enumeration
+            cy = (
+                "MATCH (s:Entity {kg_id: $kgid}) "
+                "CALL apoc.path.subgraphNodes(s, {minLevel: 1, maxLevel: $hops}) YIELD node "
+                "RETURN DISTINCT node.kg_id as kg_id LIMIT 1000"
+            )
+        else:
+            # Variable-length bounds can't be parameters; `hops` is a validated,
+            # bounded int
+            cy = (
+                "MATCH (s:Entity {kg_id: $kgid})-[*1.." + str(hops) + "]-(m) "
+                "RETURN DISTINCT m.kg_id as kg_id LIMIT 1000"
+            )
         with self.driver.session() as session:
             res = session.run(cy, kgid=node_id, hops=hops)
             return [r.get("kg_id") for r in res]
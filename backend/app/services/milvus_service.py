@@ -9,40 +9,153 @@ Notes:
   https://milvus.io/docs/zh/multi-vector-search.md
 """
 from pymilvus import connections, FieldSchema, CollectionSchema, DataType, Collection, utility
-from typing import List, Tuple, Any
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import AsyncIterator, Dict, List, Tuple, Any
+import asyncio
+import itertools
 import numpy as np
-import re
-import math
-from collections import Counter
+import os
+import queue
+import threading
+import time
+import torch
+from scipy import sparse
 
 from sentence_transformers import SentenceTransformer
 from PIL import Image
 import io
 
+from backend.app.services.query_cache import QueryCache, cached
+from backend.app.services.bm25_numba import topk_2d
+from backend.app.services.sparse_vector import SPARSE_DIM, FIELD_WEIGHTS, tokenize, token_indices, to_sparse, build_sparse
+
+# Search results keyed on (method, service, query, topk); cleared on every insert
+_QC = QueryCache(max_size=2000, ttl_seconds=300)
+
+# Dense fields use IVF_SQ8 (int8 scalar-quantised inverted lists)
+_DENSE_INDEX_PARAMS = {"index_type": "IVF_SQ8", "metric_type": "IP", "params": {"nlist": 128}}
+_DENSE_SEARCH_PARAMS = {"metric_type": "IP", "params": {"nprobe": 16}}
+
+# Per-process pool of connection aliases (one gRPC channel each) per Milvus endpoint.
+# Keyed on the pid as well: channels don't survive fork, so every worker dials its own.
+POOL_SIZE = max(4, os.cpu_count() or 1)
+_POOL: Dict[Tuple[int, str, str], List[str]] = {}
+_POOL_LOCK = threading.Lock()
+
+
+def _connection_aliases(host: str, port: str, size: int = POOL_SIZE) -> List[str]:
+    key = (os.getpid(), host, str(port))
+    with _POOL_LOCK:
+        aliases = _POOL.get(key)
+        if aliases is None:
+            aliases = [f"conn-{os.getpid()}-{host}:{port}-{i}" for i in range(size)]
+            for alias in aliases:
+                connections.connect(alias, host=host, port=port)
+            _POOL[key] = aliases
+    return aliases
+
 class MilvusService:
     def __init__(self, host="127.0.0.1", port="19530"):
         self.host = host
         self.port = port
         self.conn = None
         self.collection_name = "multimodal_docs"
+        # Collection handles per pooled connection alias (see `_collection`)
+        self._aliases = None
+        self._alias_cycle = None
+        self._colls = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+        # Element type of `text_vector`, read from the collection schema on load
+        self.text_vector_dtype = np.float32
         self.text_model = SentenceTransformer("all-MiniLM-L6-v2")
         # BM25 corpus statistics kept in-memory for sparse vector generation
         self.doc_freq = {}  # term -> document frequency
         self.total_docs = 0
         self.total_doc_len = 0
         self.dim_text = 384
+        self.sparse_dim = SPARSE_DIM  # hashed token index space of `text_sparse`
+        self._has_sparse_index = None  # resolved lazily by `search_fulltext`
+        # Opt-in in-process scoring: when set, full-text searches on collections
+        # without the sparse index score against `_bm25_matrix` instead of the
+        # substring scan, and `search_semantic_batch` uses `_corpus_matrix`.
+        self.use_local_index = False
+        # BM25 matrix (n_docs x sparse_dim, CSR) built from the stored `text_sparse`
+        # vectors by `load_local_index`; row i belongs to `_bm25_doc_ids[i]`. Queries
+        # reduce to a sparse product instead of re-deriving tf/idf per query. Dropped
+        # on insert and rebuilt on next use.
+        self._bm25_matrix = None
+        self._bm25_doc_ids = np.empty(0, dtype=np.int64)
+        # Normalised stored text embeddings (n_docs x dim_text), also built by
+        # `load_local_index`; row i belongs to `_corpus_doc_ids[i]`
+        self._corpus_matrix = None
+        self._corpus_doc_ids = np.empty(0, dtype=np.int64)
+        self._corpus_cuda = None  # device copy, rebuilt after inserts
+        self.topk_backend = "auto"  # "auto" | "numpy" | "numba", see bm25_numba
+        self._batch_engine = None
         # For image embeddings you can use a CLIP model; placeholder here
 
     def connect(self):
-        if self.conn is None:
-            connections.connect(host=self.host, port=self.port)
-            self.conn = True
+        with self._lock:
+            if self.conn is None:
+                self._aliases = _connection_aliases(self.host, self.port)
+                self._alias_cycle = itertools.cycle(self._aliases)
+                self.conn = True
+
+    def _alias(self) -> str:
+        # Round-robin over the pooled connections so concurrent calls use different channels
+        if self._alias_cycle is None:
+            self.connect()
+        return next(self._alias_cycle)
+
+    def _collection(self) -> Collection:
+        # Fetch the schema and load the collection into memory once instead of
+        # re-instantiating `Collection` (and risking an on-demand load) per call.
+        alias = self._alias()
+        coll = self._colls.get(alias)
+        if coll is None:
+            with self._lock:
+                coll = self._colls.get(alias)
+                if coll is None:
+                    coll = Collection(self.collection_name, using=alias)
+                    if not self._loaded:
+                        # Loading is server-side state; once per process is enough
+                        coll.load()
+                        self.text_vector_dtype = self._vector_dtype(coll, "text_vector")
+                        self._loaded = True
+                    self._colls[alias] = coll
+        return coll
+
+    @staticmethod
+    def _vector_dtype(coll: Collection, field_name: str):
+        for f in coll.schema.fields:
+            if f.name == field_name and f.dtype == DataType.FLOAT16_VECTOR:
+                return np.float16
+        return np.float32
+
+    def _text_vectors(self, vecs: np.ndarray) -> np.ndarray:
+        # Query/insert vectors must match the field's element type
+        return np.ascontiguousarray(vecs, dtype=self.text_vector_dtype)
 
-    def create_collection(self, dim_text=384, dim_image=512):
-        # remember text dim for sparse hashing
+    def flush(self):
+        """Seal the inserted rows into segments and re-load the collection."""
+        self._collection().flush()
+        self.reload()
+
+    def reload(self):
+        """Re-fetch and re-load the collection, e.g. after new segments were flushed."""
+        with self._lock:
+            self._colls = {}
+            self._loaded = False
+        return self._collection()
+
+    def create_collection(self, dim_text=384, dim_image=512, half_precision=True):
+        # half_precision stores text embeddings as FLOAT16_VECTOR (half the memory and
+        # bandwidth of fp32); existing collections keep whatever type they were built with.
         self.dim_text = dim_text
-        self.connect()
-        if utility.has_collection(self.collection_name):
+        alias = self._alias()
+        if utility.has_collection(self.collection_name, using=alias):
             return
 
         # Configure fields:
@@ -54,14 +167,15 @@ class MilvusService:
             FieldSchema(name="doc_id", dtype=DataType.INT64, is_primary=True, auto_id=False),
             FieldSchema(name="text", dtype=DataType.VARCHAR, max_length=65535,
                         type_params={"enable_analyzer": "true"}),
-            FieldSchema(name="text_vector", dtype=DataType.FLOAT_VECTOR, dim=dim_text),
+            FieldSchema(name="text_vector", dtype=DataType.FLOAT16_VECTOR if half_precision else DataType.FLOAT_VECTOR,
+                        dim=dim_text),
             FieldSchema(name="image_vector", dtype=DataType.FLOAT_VECTOR, dim=dim_image),
-            FieldSchema(name="text_sparse", dtype=DataType.SPARSE_FLOAT_VECTOR,
-                        type_params={"dim": str(dim_text)}, is_nullable=True),
+            # Sparse vectors carry no fixed dim; indices live in [0, SPARSE_DIM)
+            FieldSchema(name="text_sparse", dtype=DataType.SPARSE_FLOAT_VECTOR, is_nullable=True),
         ]
 
         schema = CollectionSchema(fields, description="Multimodal collection")
-        coll = Collection(self.collection_name, schema)
+        coll = Collection(self.collection_name, schema, using=alias)
 
         # Create a BM25 index on the `text` field so Milvus can serve BM25 ranking.
         # Parameters `k1` and `b` follow BM25 standard; tune as needed.
@@ -73,12 +187,27 @@ class MilvusService:
             # We choose to continue silently; callers can inspect logs if needed.
             pass
 
-    def insert_documents(self, docs: List[dict]):
-        # docs: [{'id': int, 'text': str, 'image_bytes': bytes|None}]
-        self.connect()
-        coll = Collection(self.collection_name)
+        for field in ("text_vector", "image_vector"):
+            coll.create_index(field_name=field, index_params=_DENSE_INDEX_PARAMS, index_name=f"{field}_index")
+
+        # Inverted index over the BM25 sparse vectors so `search_fulltext` is an
+        # indexed top-k search instead of a `like` scan.
+        try:
+            index_params = {"index_type": "SPARSE_INVERTED_INDEX", "metric_type": "IP"}
+            coll.create_index(field_name="text_sparse", index_params=index_params, index_name="text_sparse_index")
+        except Exception:
+            pass
+
+    def insert_documents(self, docs: List[dict], batch_size: int = 32, tokens: List[List[str]] = None, flush: bool = True):
+        # docs: [{'id': int, 'text': str, 'summary': str|None, 'image_bytes': bytes|None}]
+        # An optional summary only feeds the sparse vector, weighted per FIELD_WEIGHTS
+        # batch_size: number of texts per embedding forward pass
+        # tokens: optional pre-tokenized texts (one list per doc) to skip re-tokenization
+        # flush: seal and reload after this insert; bulk loaders pass False per batch
+        # and call `flush()` once at the end
+        coll = self._collection()
         texts = [d.get("text", "") for d in docs]
-        text_vecs = self.text_model.encode(texts, convert_to_numpy=True).astype(np.float32)
+        text_vecs = self.text_model.encode(texts, batch_size=batch_size, convert_to_numpy=True).astype(np.float32)
 
         # placeholder image vectors: zeros or computed via CLIP
         img_vecs = []
@@ -92,23 +221,36 @@ class MilvusService:
 
         ids = [d.get("id") for d in docs]
         # Update BM25 corpus stats with incoming documents, then compute sparse vectors.
-        self._update_corpus_stats(texts)
-        sparse_vectors = [self.bm25_sparse_vector(t) for t in texts]
+        summaries = [d.get("summary") for d in docs]
+        sparse_vectors = self.bm25_sparse_vectors_batch(texts, summaries=summaries if any(summaries) else None, token_lists=tokens)
 
-        entities = [ids, texts, text_vecs.tolist(), np.stack(img_vecs).tolist(), sparse_vectors]
+        # Pass contiguous float32 arrays straight to pymilvus instead of boxing every
+        # float into a Python list.
+        entities = [ids, texts, self._text_vectors(text_vecs), np.stack(img_vecs), sparse_vectors]
         # Note: we currently don't auto-generate BM25 sparse embeddings here; Milvus can
         # compute BM25 ranking from the `text` field when `enable_analyzer` + BM25 index
         # are configured.
         coll.insert(entities)
+        if flush:
+            self.flush()
+        self._bm25_matrix = None
+        self._corpus_matrix = None
+        self._corpus_cuda = None
+        _QC.clear()
+
+    def cache_stats(self) -> dict:
+        """Hit/miss/eviction counters of the search result cache."""
+        return _QC.stats()
 
     def _tokenize(self, text: str) -> List[str]:
-        # simple word tokenizer; lowercase and keep word chars
-        return re.findall(r"\w+", text.lower())
+        return tokenize(text)
 
     def _update_corpus_stats(self, texts: List[str]):
+        self._update_corpus_stats_tokens([self._tokenize(t) for t in texts])
+
+    def _update_corpus_stats_tokens(self, token_lists: List[List[str]]):
         # Update document frequency and length stats for BM25
-        for t in texts:
-            tokens = self._tokenize(t)
+        for tokens in token_lists:
             if not tokens:
                 # still count as a document
                 self.total_docs += 1
@@ -120,75 +262,357 @@ class MilvusService:
             self.total_doc_len += len(tokens)
 
     def bm25_sparse_vector(self, text: str, k1: float = 1.2, b: float = 0.75) -> dict:
-        """Convert `text` into a sparse vector (dict with `indices` and `values`) using BM25 weights.
+        """Convert `text` into a sparse vector ({index: weight} dict) using BM25 weights.
 
         - Uses in-memory corpus stats (`self.doc_freq`, `self.total_docs`, `self.total_doc_len`).
-        - Maps terms to vector indices using a stable hash modulo `self.dim_text`.
-        - Returns {'indices': [...], 'values': [...]} which is compatible with Milvus SPARSE_FLOAT_VECTOR inserts.
+        - Maps terms to vector indices with MurmurHash3 modulo `self.sparse_dim`.
+        - Returns {index: value, ...} which is the format Milvus SPARSE_FLOAT_VECTOR inserts accept.
         """
-        tokens = self._tokenize(text)
+        return self._bm25_from_tokens(self._tokenize(text), k1, b)
+
+    def bm25_sparse_vectors_batch(self, texts: List[str], k1: float = 1.2, b: float = 0.75,
+                                  summaries: List[str] = None, token_lists: List[List[str]] = None) -> List[dict]:
+        """Add `texts` to the corpus stats and return their BM25 sparse vectors.
+
+        Each text is tokenized once and the stats are updated in a single pass
+        before any vector is computed, so every vector sees the same corpus.
+        With `summaries`, each summary's BM25 weights are added to its document's
+        vector scaled by `FIELD_WEIGHTS["summary"]`. `token_lists` may carry the
+        texts already tokenized with `sparse_vector.tokenize`.
+        """
+        if token_lists is None:
+            token_lists = [self._tokenize(t) for t in texts]
+        if not summaries:
+            self._update_corpus_stats_tokens(token_lists)
+            return [self._bm25_from_tokens(tokens, k1, b) for tokens in token_lists]
+
+        summary_lists = [self._tokenize(s) if s else [] for s in summaries]
+        self._update_corpus_stats_tokens([t + s for t, s in zip(token_lists, summary_lists)])
+        out = []
+        for tokens, summary in zip(token_lists, summary_lists):
+            t_terms, t_scores = self._bm25_weights(tokens, k1, b)
+            s_terms, s_scores = self._bm25_weights(summary, k1, b)
+            out.append(self._to_sparse(
+                np.concatenate([t_terms, s_terms]),
+                np.concatenate([t_scores * FIELD_WEIGHTS["text"], s_scores * FIELD_WEIGHTS["summary"]]),
+            ))
+        return out
+
+    def _bm25_from_tokens(self, tokens: List[str], k1: float, b: float) -> dict:
+        return self._to_sparse(*self._bm25_weights(tokens, k1, b))
+
+    def _bm25_weights(self, tokens: List[str], k1: float, b: float) -> Tuple[np.ndarray, np.ndarray]:
         if not tokens or self.total_docs == 0:
-            return None
+            return np.empty(0, dtype=str), np.empty(0, dtype=np.float64)
 
-        tf = Counter(tokens)
+        # Term frequencies and BM25 weights are computed over NumPy arrays
+        terms, freq = np.unique(np.array(tokens), return_counts=True)
         dl = len(tokens)
         avgdl = (self.total_doc_len / self.total_docs) if self.total_docs > 0 else dl
 
-        idx2val = {}
-        for term, freq in tf.items():
-            df = self.doc_freq.get(term, 0)
-            # smoothed idf
-            idf = math.log((self.total_docs - df + 0.5) / (df + 0.5) + 1)
-            denom = freq + k1 * (1 - b + b * (dl / avgdl)) if avgdl > 0 else freq + k1
-            score = idf * ((freq * (k1 + 1)) / denom)
-            idx = abs(hash(term)) % self.dim_text
-            idx2val[idx] = idx2val.get(idx, 0.0) + float(score)
+        df = np.fromiter((self.doc_freq.get(t, 0) for t in terms), dtype=np.float64, count=len(terms))
+        # smoothed idf
+        idf = np.log((self.total_docs - df + 0.5) / (df + 0.5) + 1)
+        denom = freq + k1 * (1 - b + b * (dl / avgdl)) if avgdl > 0 else freq + k1
+        scores = idf * ((freq * (k1 + 1)) / denom)
+        return terms, scores
 
-        if not idx2val:
-            return None
+    def _to_sparse(self, terms: np.ndarray, weights: np.ndarray) -> dict:
+        # Hashing trick: no vocabulary to maintain, collisions are summed
+        return to_sparse(token_indices(terms, self.sparse_dim), weights)
 
-        indices = list(idx2val.keys())
-        values = [idx2val[i] for i in indices]
-        return {"indices": indices, "values": values}
+    def _sparse_rows(self, vectors: List[dict]) -> sparse.csr_matrix:
+        # {index: weight} dicts (None for empty texts) -> one CSR row each
+        vectors = [v or {} for v in vectors]
+        indptr = np.cumsum([0] + [len(v) for v in vectors])
+        indices = np.fromiter((i for v in vectors for i in v), dtype=np.int32, count=indptr[-1])
+        data = np.fromiter((w for v in vectors for w in v.values()), dtype=np.float32, count=indptr[-1])
+        return sparse.csr_matrix((data, indices, indptr), shape=(len(vectors), self.sparse_dim))
 
-    def search_semantic(self, query: str, topk=10) -> List[Tuple[Any, float, str]]:
-        self.connect()
-        coll = Collection(self.collection_name)
-        qvec = self.text_model.encode([query])[0].astype(np.float32)
-        search_params = {"metric_type": "IP", "params": {"nprobe": 10}}
-        res = coll.search([qvec.tolist()], "text_vector", param=search_params, limit=topk, output_fields=["doc_id", "text"])
+    def load_local_index(self, batch_size: int = 1000):
+        """Build the in-process BM25 and embedding matrices from the stored
+        `text_sparse` and `text_vector` fields.
+
+        Pages through the whole collection once, so the matrices cover documents
+        inserted by any process, and assembles each with a single construction.
+        """
+        coll = self._collection()
+        ids, vectors, embeddings = [], [], []
+        it = coll.query_iterator(batch_size=batch_size, output_fields=["doc_id", "text_sparse", "text_vector"])
+        try:
+            while True:
+                page = it.next()
+                if not page:
+                    break
+                for r in page:
+                    ids.append(r["doc_id"])
+                    vectors.append(r.get("text_sparse"))
+                    embeddings.append(self._stored_vector(r["text_vector"]))
+        finally:
+            it.close()
+        self._bm25_matrix = self._sparse_rows(vectors)
+        self._bm25_doc_ids = np.asarray(ids, dtype=np.int64)
+        if ids:
+            emb = np.asarray(embeddings, dtype=np.float32).reshape(len(ids), -1)
+        else:
+            # Empty collection: (0, dim) so searches return empty hit lists
+            emb = np.zeros((0, self.dim_text), dtype=np.float32)
+        self._corpus_matrix = np.ascontiguousarray(emb / np.maximum(np.linalg.norm(emb, axis=1, keepdims=True), 1e-12))
+        self._corpus_doc_ids = self._bm25_doc_ids
+        self._corpus_cuda = None
+
+    @staticmethod
+    def _stored_vector(v) -> np.ndarray:
+        # FLOAT16_VECTOR fields come back as raw bytes (possibly wrapped in a list)
+        if isinstance(v, list) and len(v) == 1 and isinstance(v[0], bytes):
+            v = v[0]
+        if isinstance(v, bytes):
+            return np.frombuffer(v, dtype=np.float16).astype(np.float32)
+        return np.asarray(v, dtype=np.float32)
+
+    def encode_batch(self, queries: List[str]) -> np.ndarray:
+        """(Q, D) float32 matrix of L2-normalised query embeddings."""
+        vecs = self.text_model.encode(list(queries), batch_size=64, convert_to_numpy=True, normalize_embeddings=True)
+        return np.ascontiguousarray(vecs, dtype=np.float32)
+
+    def search_semantic_batch(self, queries: List[str], topk=10) -> List[List[Tuple[Any, float, str]]]:
+        """Cosine search for many queries with a single (Q, D) x (D, N) matmul.
+
+        With `use_local_index` set, scores against the stored embeddings loaded by
+        `load_local_index` (SGEMM on CPU, torch on CUDA when available); otherwise
+        runs one multi-query Milvus search.
+        """
+        queries = list(queries)
+        if not queries:
+            return []
+        if not self.use_local_index:
+            return self._search_semantic_many(queries, topk)
+        if self._corpus_matrix is None:
+            self.load_local_index()
+
+        q = self.encode_batch(queries)
+        if torch.cuda.is_available():
+            if self._corpus_cuda is None:
+                self._corpus_cuda = torch.from_numpy(self._corpus_matrix).cuda()
+            scores = (torch.from_numpy(q).cuda() @ self._corpus_cuda.T).cpu().numpy()
+        else:
+            scores = q @ self._corpus_matrix.T
+        top = topk_2d(scores, topk, backend=self.topk_backend)
+        return [
+            [(int(self._corpus_doc_ids[i]), float(row[i]), "semantic") for i in idx]
+            for row, idx in zip(scores, top)
+        ]
+
+    def get_scores_batched(self, queries: List[str]) -> np.ndarray:
+        """BM25 scores of every stored document for each query.
+
+        Returns an (n_queries, n_docs) array whose columns follow `_bm25_doc_ids`;
+        all queries are scored with one sparse matrix product. Loads the local
+        index first if it is not built yet.
+        """
+        if self._bm25_matrix is None:
+            self.load_local_index()
+        q = self._sparse_rows([self._query_sparse_vector(query) for query in queries])
+        return (q @ self._bm25_matrix.T).toarray()
+
+    def _search_fulltext_local(self, queries: List[str], topk=10) -> List[List[Tuple[Any, float, str]]]:
+        scores = self.get_scores_batched(queries)
         out = []
-        for hits in res:
-            for h in hits:
-                out.append((h.entity.get("doc_id"), float(h.score), "semantic"))
+        for row, top in zip(scores, topk_2d(scores, topk, backend=self.topk_backend)):
+            out.append([(int(self._bm25_doc_ids[i]), float(row[i]), "fulltext") for i in top if row[i] > 0])
         return out
 
+    def _query_sparse_vector(self, query: str) -> dict:
+        # Weight each query term by its count: the inner product with a document's
+        # BM25 sparse vector is then the document's BM25 score for the query.
+        return build_sparse(query, self.sparse_dim) or None
+
+    @cached(cache=_QC)
+    def search_semantic(self, query: str, topk=10) -> List[Tuple[Any, float, str]]:
+        return self._search_semantic_many([query], topk)[0]
+
+    def _search_semantic_many(self, queries: List[str], topk=10) -> List[List[Tuple[Any, float, str]]]:
+        # All queries are encoded in one forward pass and sent as one multi-vector search
+        coll = self._collection()
+        qvecs = self._text_vectors(self.text_model.encode(list(queries), convert_to_numpy=True))
+        res = coll.search(qvecs, "text_vector", param=_DENSE_SEARCH_PARAMS, limit=topk, output_fields=["doc_id", "text"])
+        return [[(h.entity.get("doc_id"), float(h.score), "semantic") for h in hits] for hits in res]
+
+    async def stream_semantic(self, query: str, topk=10, batch_size: int = 64) -> AsyncIterator[dict]:
+        """Yield semantic hits one by one as pages arrive from `search_iterator`.
+
+        Only one page of `batch_size` hits is held at a time, and the caller sees the
+        first hit after the first page instead of after the whole result set.
+        """
+        loop = asyncio.get_running_loop()
+        # `_collection` may connect and load the collection, so it runs off the loop too
+        coll, qvec = await loop.run_in_executor(None, lambda: (
+            self._collection(), self._text_vectors(self.text_model.encode([query], convert_to_numpy=True))))
+        it = await loop.run_in_executor(None, lambda: coll.search_iterator(
+            data=qvec, anns_field="text_vector", param=_DENSE_SEARCH_PARAMS,
+            batch_size=min(batch_size, topk), limit=topk, output_fields=["doc_id"]))
+        try:
+            while True:
+                page = await loop.run_in_executor(None, it.next)
+                if not page:
+                    break
+                for h in page:
+                    yield {"doc_id": h.entity.get("doc_id"), "score": float(h.score), "source": "semantic"}
+        finally:
+            it.close()
+
+    def _search_fulltext_many(self, queries: List[str], topk=10) -> List[List[Tuple[Any, float, str]]]:
+        coll = self._collection()
+        if self._has_sparse_index is None:
+            self._has_sparse_index = utility.has_index(self.collection_name, index_name="text_sparse_index", using=self._alias())
+        if not self._has_sparse_index:
+            if self.use_local_index:
+                return self._search_fulltext_local(queries, topk)
+            return [self._search_fulltext_like(coll, q, topk) for q in queries]
+
+        # BM25 via the indexed `text_sparse` field: server-side top-k, no expression
+        # built from user input. One sparse search for every query with a token.
+        qvecs = [self._query_sparse_vector(q) for q in queries]
+        idx = [i for i, v in enumerate(qvecs) if v]
+        out = [[] for _ in queries]
+        if idx:
+            search_params = {"metric_type": "IP", "params": {"drop_ratio_search": 0.2}}
+            res = coll.search([qvecs[i] for i in idx], "text_sparse", param=search_params, limit=topk, output_fields=["doc_id"])
+            for i, hits in zip(idx, res):
+                out[i] = [(h.entity.get("doc_id"), float(h.score), "fulltext") for h in hits]
+        return out
+
+    async def batch_search(self, queries: List[str], topk=10) -> List[dict]:
+        """Run full-text and semantic search for all `queries` concurrently.
+
+        Each modality is a single multi-query Milvus request; the two requests run in
+        the default executor so the total latency is the slower of the two.
+        Returns one {"fulltext", "semantic"} dict per query.
+        """
+        queries = list(queries)
+        if not queries:
+            return []
+        loop = asyncio.get_running_loop()
+        fulltext, semantic = await asyncio.gather(
+            loop.run_in_executor(None, self._search_fulltext_many, queries, topk),
+            loop.run_in_executor(None, self._search_semantic_many, queries, topk),
+        )
+        return [{"fulltext": f, "semantic": s} for f, s in zip(fulltext, semantic)]
+
+    def batch_engine(self) -> "BatchSearchEngine":
+        """Shared engine that coalesces concurrent searches into batched requests."""
+        if self._batch_engine is None:
+            with self._lock:
+                if self._batch_engine is None:
+                    self._batch_engine = BatchSearchEngine(self)
+        return self._batch_engine
+
     def search_image(self, image_bytes: bytes, topk=10) -> List[Tuple[Any, float, str]]:
-        self.connect()
-        coll = Collection(self.collection_name)
+        if not image_bytes:
+            return []
+        coll = self._collection()
         # TODO: compute image embedding via CLIP
         qvec = np.zeros(512, dtype=np.float32)
-        search_params = {"metric_type": "IP", "params": {"nprobe": 10}}
-        res = coll.search([qvec.tolist()], "image_vector", param=search_params, limit=topk, output_fields=["doc_id", "text"])
+        res = coll.search(qvec.reshape(1, -1), "image_vector", param=_DENSE_SEARCH_PARAMS, limit=topk, output_fields=["doc_id", "text"])
         out = []
         for hits in res:
             for h in hits:
                 out.append((h.entity.get("doc_id"), float(h.score), "image"))
         return out
 
+    @cached(cache=_QC)
     def search_fulltext(self, query: str, topk=10) -> List[Tuple[Any, float, str]]:
-        # Milvus full-text BM25 integration requires collection with TEXT fields and enabled text index.
-        # As a scaffold we run a simple filter+placeholder score using collection.query
-        self.connect()
-        coll = Collection(self.collection_name)
-        # escape single quotes in the user query for safe query expression
-        safe = query.replace("'", "\\'")
+        return self._search_fulltext_many([query], topk)[0]
+
+    @staticmethod
+    def _search_fulltext_like(coll: Collection, query: str, topk=10) -> List[Tuple[Any, float, str]]:
+        # Last resort for collections without the sparse index: substring scan with a
+        # placeholder score. Escape backslashes and single quotes for the expression.
+        safe = query.replace("\\", "\\\\").replace("'", "\\'")
         expr = f"text like '%{safe}%'"
         try:
-            qres = coll.query(expr=expr, output_fields=["doc_id", "text"])
+            qres = coll.query(expr=expr, output_fields=["doc_id", "text"], limit=topk)
         except Exception:
             qres = []
         out = []
         for r in qres[:topk]:
             out.append((r.get("doc_id"), 1.0, "fulltext"))
         return out
+
+
+class _SearchRequest:
+    __slots__ = ("kind", "query", "topk", "future")
+
+    def __init__(self, kind: str, query: str, topk: int):
+        self.kind = kind
+        self.query = query
+        self.topk = topk
+        self.future = Future()
+
+
+class BatchSearchEngine:
+    """Submission/completion queue in front of a MilvusService.
+
+    Callers enqueue single queries and get a Future back. A daemon thread drains up
+    to `max_batch` pending requests (waiting at most `max_wait` seconds for more to
+    arrive), sends one multi-query search per (kind, topk) group and resolves the
+    futures, so concurrent callers share one encode pass and one RPC.
+    """
+
+    def __init__(self, service: MilvusService, max_batch: int = 32, max_wait: float = 0.0005):
+        self.service = service
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.q = queue.Queue()
+        self._search = {
+            "semantic": service._search_semantic_many,
+            "fulltext": service._search_fulltext_many,
+        }
+        self._thread = threading.Thread(target=self._run, name="milvus-batch-search", daemon=True)
+        self._thread.start()
+
+    def submit(self, kind: str, query: str, topk: int = 10) -> Future:
+        if kind not in self._search:
+            raise ValueError(f"Unsupported search kind: {kind}")
+        req = _SearchRequest(kind, query, topk)
+        self.q.put(req)
+        return req.future
+
+    def search_semantic(self, query: str, topk: int = 10) -> Future:
+        return self.submit("semantic", query, topk)
+
+    def search_fulltext(self, query: str, topk: int = 10) -> Future:
+        return self.submit("fulltext", query, topk)
+
+    def _drain(self) -> List[_SearchRequest]:
+        pending = [self.q.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(pending) < self.max_batch:
+            timeout = deadline - time.monotonic()
+            try:
+                pending.append(self.q.get(timeout=timeout) if timeout > 0 else self.q.get_nowait())
+            except queue.Empty:
+                break
+        return pending
+
+    def _run(self):
+        while True:
+            groups = {}
+            for req in self._drain():
+                if req.future.set_running_or_notify_cancel():
+                    groups.setdefault((req.kind, req.topk), []).append(req)
+            for (kind, topk), reqs in groups.items():
+                try:
+                    results = self._search[kind]([r.query for r in reqs], topk)
+                except Exception as e:
+                    for r in reqs:
+                        r.future.set_exception(e)
+                    continue
+                for r, hits in zip(reqs, results):
+                    r.future.set_result(hits)
+
+
+@lru_cache(maxsize=1)
+def get_service(host="127.0.0.1", port="19530") -> MilvusService:
+    """Process-wide MilvusService: one connection and one loaded embedding model."""
+    return MilvusService(host=host, port=port)
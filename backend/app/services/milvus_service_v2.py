@@ -7,6 +7,8 @@ Based on Milvus multi-vector hybrid search documentation.
 """
 from pymilvus import MilvusClient, DataType, Function, FunctionType, AnnSearchRequest
 from typing import List, Tuple, Any
+import hashlib
+import threading
 import numpy as np
 from sentence_transformers import SentenceTransformer
 from PIL import Image
@@ -14,12 +16,38 @@ import io
 import clip
 import torch
 
+from backend.app.services.query_cache import QueryCache
+
+# Query embeddings only depend on the model, so they are shared by all service
+# instances and never need invalidating.
+_embedding_cache = QueryCache(max_size=4096)
+
+
+def _model_key(model, default_name: str) -> tuple:
+    """Identify `model` in `_embedding_cache` keys: the ONNX file for an
+    OnnxTextEncoder, otherwise the class and the checkpoint it was loaded from."""
+    path = getattr(model, "model_path", None)
+    if path:
+        return (type(model).__name__, path)
+    name = getattr(getattr(model, "tokenizer", None), "name_or_path", None)
+    return (type(model).__name__, name or default_name)
+
+
 class MilvusService:
-    def __init__(self, uri="http://127.0.0.1:19530", collection_name="multimodal_docs"):
+    def __init__(self, uri="http://127.0.0.1:19530", collection_name="multimodal_docs", text_model=None):
         self.uri = uri
         self.collection_name = collection_name
         self.client = MilvusClient(uri=uri)
-        self.text_model = SentenceTransformer("all-MiniLM-L6-v2")
+        self.text_model_name = "all-MiniLM-L6-v2"
+        # Reuse a model loaded (and warmed up) by the app lifespan when given
+        self.text_model = text_model if text_model is not None else SentenceTransformer(self.text_model_name)
+        self._model_key = _model_key(self.text_model, self.text_model_name)
+        # Short-lived search result cache; `_generation` is part of every key and is
+        # bumped on insert so stale results are never served after a write.
+        self._result_cache = QueryCache(max_size=1024, ttl_seconds=120)
+        self._generation = 0
+        self._loaded = False
+        self._load_lock = threading.Lock()
         # Load CLIP model for image embeddings
         self.clip_model, self.clip_preprocess = clip.load("ViT-B/32", device="cpu")
 
@@ -74,25 +102,32 @@ class MilvusService:
             index_params=index_params
         )
 
+    @property
+    def generation(self) -> int:
+        """Counter bumped on every insert; include it in result cache keys."""
+        return self._generation
+
     def load_collection(self):
         self.client.load_collection(self.collection_name)
+        self._loaded = True
+
+    def _ensure_loaded(self):
+        # Load once per process instead of issuing a load RPC on every search
+        if not self._loaded:
+            with self._load_lock:
+                if not self._loaded:
+                    self.load_collection()
 
     def insert_documents(self, docs: List[dict]):
         texts = [d.get("text", "") for d in docs]
-        text_dense_vecs = self.text_model.encode(texts, convert_to_numpy=True).astype(np.float32).tolist()
-
-        image_dense_vecs = []
-        for d in docs:
-            b = d.get("image_bytes")
-            if b:
-                # Compute CLIP image embedding
-                img = Image.open(io.BytesIO(b))
-                img_input = self.clip_preprocess(img).unsqueeze(0)
-                with torch.no_grad():
-                    img_features = self.clip_model.encode_image(img_input).cpu().numpy().flatten()
-                image_dense_vecs.append(img_features.tolist())
-            else:
-                image_dense_vecs.append([0.0] * 512)  # Placeholder
+        # Vectors stay as contiguous float32 arrays; pymilvus serialises them directly,
+        # so there's no need to box every float into a Python list first.
+        text_dense_vecs = np.ascontiguousarray(self.text_model.encode(texts, convert_to_numpy=True), dtype=np.float32)
+
+        image_dense_vecs = np.zeros((len(docs), 512), dtype=np.float32)  # Placeholder for docs without an image
+        image_idx = [i for i, d in enumerate(docs) if d.get("image_bytes")]
+        if image_idx:
+            image_dense_vecs[image_idx] = self._encode_images([docs[i]["image_bytes"] for i in image_idx])
 
         ids = [d.get("id") for d in docs]
         data = [
@@ -100,11 +135,115 @@ class MilvusService:
             for id_, text, dense, img in zip(ids, texts, text_dense_vecs, image_dense_vecs)
         ]
         self.client.insert(collection_name=self.collection_name, data=data)
+        self._generation += 1
+
+    def _encode_text(self, query: str) -> np.ndarray:
+        return self._encode_texts([query])[0]
+
+    def _encode_texts(self, queries: List[str]) -> np.ndarray:
+        # Cached vectors are read-only so callers can't corrupt shared entries.
+        # All cache misses are encoded together in one batched forward pass.
+        vecs = [_embedding_cache.get((self._model_key, q)) for q in queries]
+        missing = list(dict.fromkeys(q for q, v in zip(queries, vecs) if v is None))
+        if missing:
+            encoded = dict(zip(missing, self.text_model.encode(missing, convert_to_numpy=True, batch_size=32).astype(np.float32)))
+            for q, vec in encoded.items():
+                vec.setflags(write=False)
+                _embedding_cache.set((self._model_key, q), vec)
+            vecs = [v if v is not None else encoded[q] for q, v in zip(queries, vecs)]
+        return np.stack(vecs)
+
+    def _encode_images(self, images: List[bytes]) -> np.ndarray:
+        # Compute CLIP image embeddings for all images in one forward pass
+        img_inputs = torch.stack([self.clip_preprocess(Image.open(io.BytesIO(b))) for b in images])
+        with torch.no_grad():
+            return self.clip_model.encode_image(img_inputs).cpu().numpy().astype(np.float32)
+
+    def _search_field(self, data: list, anns_field: str, search_params: dict, topk: int, source: str) -> List[List[Tuple[Any, float, str]]]:
+        # One Milvus request for the whole batch; returns one hit-list per input
+        self._ensure_loaded()
+        res = self.client.search(
+            collection_name=self.collection_name,
+            data=data,
+            anns_field=anns_field,
+            search_params=search_params,
+            limit=topk,
+            output_fields=["doc_id"]
+        )
+        return [
+            [(hit.get("entity", {}).get("doc_id"), float(hit.get("distance", 0)), source) for hit in hits]
+            for hits in res
+        ]
+
+    def search_semantic(self, queries, topk=10):
+        """Dense text search. Accepts a single query or a list of queries; a list
+        returns one hit-list per query and is encoded/searched in a single batch."""
+        single = isinstance(queries, str)
+        qs = [queries] if single else list(queries)
+        if not qs:
+            return []
+        vecs = self._encode_texts(qs)
+        out = self._search_field(list(vecs), "text_dense", {"metric_type": "IP", "params": {"nprobe": 10}}, topk, "semantic")
+        return out[0] if single else out
+
+    def search_fulltext(self, queries, topk=10):
+        """BM25 search over the `text_sparse` field. Accepts a single query or a list."""
+        single = isinstance(queries, str)
+        qs = [queries] if single else list(queries)
+        if not qs:
+            return []
+        # For sparse BM25 search the data is the raw query text
+        out = self._search_field(qs, "text_sparse", {"metric_type": "BM25"}, topk, "fulltext")
+        return out[0] if single else out
+
+    def search_image(self, images, topk=10):
+        """Dense image search. Accepts a single image (bytes) or a list of images; a
+        list returns one hit-list per entry, empty for missing (None/b"") images."""
+        if not images:
+            return []
+        single = isinstance(images, (bytes, bytearray))
+        imgs = [images] if single else list(images)
+        # Only real images are encoded and searched; results go back by position
+        idx = [i for i, b in enumerate(imgs) if b]
+        out = [[] for _ in imgs]
+        if idx:
+            vecs = self._encode_images([imgs[i] for i in idx])
+            hits = self._search_field(list(vecs), "image_dense", {"metric_type": "IP", "params": {"nprobe": 10}}, topk, "image")
+            for i, h in zip(idx, hits):
+                out[i] = h
+        return out[0] if single else out
+
+    def batch_search(self, queries: List[str], images: List[bytes] = None, topk=10) -> List[dict]:
+        """Run semantic, full-text and image search for N queries at once.
+
+        `images[i]` (optional) belongs to `queries[i]`. Each modality is encoded in one
+        batch and sent to Milvus as one multi-vector search request.
+        Returns one {"fulltext", "semantic", "image"} dict per query.
+        """
+        images = list(images or [])[:len(queries)]
+        images += [None] * (len(queries) - len(images))
+
+        semantic = self.search_semantic(list(queries), topk)
+        fulltext = self.search_fulltext(list(queries), topk)
+        image = self.search_image(images, topk)
+
+        return [
+            {"fulltext": f, "semantic": s, "image": im}
+            for f, s, im in zip(fulltext, semantic, image)
+        ]
+
+    def multi_vector_search(self, query: str, image_bytes: bytes = None, topk=10) -> dict:
+        return self.batch_search([query], [image_bytes], topk)[0]
 
     def hybrid_search(self, query: str, image_bytes: bytes = None, topk=10) -> List[Tuple[Any, float, dict]]:
-        self.load_collection()
-        # ... rest of the method
-        query_dense_vector = self.text_model.encode([query], convert_to_numpy=True)[0].astype(np.float32).tolist()
+        image_hash = hashlib.blake2b(image_bytes, digest_size=8).hexdigest() if image_bytes else None
+        cache_key = (self._generation, query, image_hash, topk)
+        cached = self._result_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+
+        self._ensure_loaded()
+        query_dense_vector = self._encode_text(query)
 
         reqs = []
 
@@ -129,10 +268,7 @@ class MilvusService:
 
         # Image search if image provided
         if image_bytes:
-            img = Image.open(io.BytesIO(image_bytes))
-            img_input = self.clip_preprocess(img).unsqueeze(0)
-            with torch.no_grad():
-                query_image_vector = self.clip_model.encode_image(img_input).cpu().numpy().flatten().tolist()
+            query_image_vector = self._encode_images([image_bytes])[0]
             search_param_3 = {
                 "data": [query_image_vector],
                 "anns_field": "image_dense",
@@ -165,4 +301,5 @@ class MilvusService:
             for hit in hits:
                 entity = hit.get("entity", {})
                 out.append((entity.get("doc_id"), float(hit.get("distance", 0)), "hybrid"))
-        return out
+        self._result_cache.set(cache_key, out)
+        return list(out)
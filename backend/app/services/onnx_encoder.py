@@ -0,0 +1,74 @@
+"""
+Int8-quantized ONNX Runtime drop-in for the SentenceTransformer text encoder.
+
+`export_quantized()` exports `all-MiniLM-L6-v2` to ONNX and applies dynamic int8
+quantization (AVX512-VNNI config), which roughly halves CPU inference time with
+negligible recall loss. `OnnxTextEncoder` loads the result and exposes the
+subset of `SentenceTransformer.encode` the services use (mean pooling + L2
+normalization, matching the original model's pipeline).
+
+Optional dependencies: `onnxruntime` and `transformers` to run the model,
+`optimum[onnxruntime]` to export it. Callers fall back to the FP32
+SentenceTransformer when they are not installed.
+"""
+import os
+from typing import List, Union
+
+import numpy as np
+
+try:
+    import onnxruntime as ort
+    from transformers import AutoTokenizer
+except Exception:
+    ort = None
+
+
+def export_quantized(model_name: str = "sentence-transformers/all-MiniLM-L6-v2", out_dir: str = "models/minilm-int8") -> str:
+    """Export `model_name` to ONNX and quantize it to int8 in `out_dir`."""
+    from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import AutoTokenizer
+
+    fp32_dir = out_dir + "-fp32"
+    ORTModelForFeatureExtraction.from_pretrained(model_name, export=True).save_pretrained(fp32_dir)
+    AutoTokenizer.from_pretrained(model_name).save_pretrained(out_dir)
+
+    quantizer = ORTQuantizer.from_pretrained(fp32_dir)
+    qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+    quantizer.quantize(save_dir=out_dir, quantization_config=qconfig)
+    return out_dir
+
+
+class OnnxTextEncoder:
+    def __init__(self, model_dir: str, max_length: int = 256):
+        if ort is None:
+            raise RuntimeError("onnxruntime/transformers not installed; cannot load ONNX encoder")
+        model_file = "model_quantized.onnx"
+        if not os.path.exists(os.path.join(model_dir, model_file)):
+            model_file = "model.onnx"
+        self.model_path = os.path.abspath(os.path.join(model_dir, model_file))
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.session = ort.InferenceSession(self.model_path, providers=["CPUExecutionProvider"])
+        self._input_names = {i.name for i in self.session.get_inputs()}
+        self.max_length = max_length
+
+    def encode(self, sentences: Union[str, List[str]], batch_size: int = 32, convert_to_numpy: bool = True,
+               normalize_embeddings: bool = True, **kwargs) -> np.ndarray:
+        single = isinstance(sentences, str)
+        sentences = [sentences] if single else list(sentences)
+
+        out = []
+        for start in range(0, len(sentences), batch_size):
+            enc = self.tokenizer(sentences[start:start + batch_size], padding=True, truncation=True,
+                                 max_length=self.max_length, return_tensors="np")
+            feeds = {k: v.astype(np.int64) for k, v in enc.items() if k in self._input_names}
+            token_emb = self.session.run(None, feeds)[0]
+            # Mean pooling over non-padding tokens
+            mask = enc["attention_mask"][..., None].astype(np.float32)
+            emb = (token_emb * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            if normalize_embeddings:
+                emb /= np.clip(np.linalg.norm(emb, axis=1, keepdims=True), 1e-12, None)
+            out.append(emb.astype(np.float32))
+
+        embs = np.concatenate(out) if out else np.zeros((0, 0), dtype=np.float32)
+        return embs[0] if single else embs
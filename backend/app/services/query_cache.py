@@ -0,0 +1,83 @@
+"""
+Small in-process LRU cache with an optional per-entry TTL.
+
+Used by the Milvus services to memoise query embeddings and search results so
+repeated queries skip the model forward pass and the Milvus round-trip.
+Thread-safe: the API handlers call the services from worker threads.
+"""
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+import functools
+import threading
+import time
+
+_MISSING = object()
+
+
+class QueryCache:
+    def __init__(self, max_size: int = 4096, ttl_seconds: Optional[float] = None):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        # Under the lock so the counters and size form one consistent snapshot
+        with self._lock:
+            return {"size": len(self._data), "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+def cached(cache: QueryCache, key: Optional[Callable[..., Hashable]] = None):
+    """Memoise a function in `cache`.
+
+    The default key is the function name plus its positional and keyword arguments
+    (for methods this includes `self`), so all arguments must be hashable. Cached
+    values are shared between callers and must not be mutated.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            k = key(*args, **kwargs) if key else (fn.__qualname__, args, tuple(sorted(kwargs.items())))
+            value = cache.get(k, _MISSING)
+            if value is _MISSING:
+                value = fn(*args, **kwargs)
+                cache.set(k, value)
+            return value
+        wrapper.cache = cache
+        return wrapper
+    return decorator
@@ -3,6 +3,33 @@ Reranker utilities: implements Reciprocal Rank Fusion (RRF)
 to combine multiple ranked lists into a single fused ranking.
 """
 from typing import List, Tuple, Any
+import numpy as np
+
+try:
+    from numba import njit
+except Exception:
+    njit = None
+
+# Below this many ranked items NumPy's setup cost outweighs the vectorised maths,
+# so small fusions stay on the plain-Python path.
+_NUMPY_MIN_ITEMS = 64
+
+# Guard against a misconfigured caller passing unbounded lists: RRF contributions
+# this deep are negligible anyway.
+_MAX_LIST_LEN = 10_000
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _rrf_scores_jit(idx, ranks, n, k):
+        # Fused reciprocal + scatter-add in one compiled loop
+        scores = np.zeros(n)
+        for i in range(idx.shape[0]):
+            scores[idx[i]] += 1.0 / (k + ranks[i])
+        return scores
+else:
+    _rrf_scores_jit = None
+
 
 def rrf_fuse(ranked_lists: List[List[Tuple[Any, float, str]]], k: int = 60) -> List[Tuple[Any, float]]:
     """Fuse multiple ranked lists using RRF.
@@ -10,6 +37,26 @@ def rrf_fuse(ranked_lists: List[List[Tuple[Any, float, str]]], k: int = 60) -> L
     ranked_lists: list of lists, each element is (doc_id, score, source)
     Returns list of (doc_id, fused_score) sorted desc.
     """
+    ranked_lists = [rl[:_MAX_LIST_LEN] for rl in ranked_lists]
+    if sum(len(rl) for rl in ranked_lists) < _NUMPY_MIN_ITEMS:
+        return _rrf_fuse_py(ranked_lists, k)
+
+    # Map doc ids to dense indices, preserving first-seen order for stable ties
+    ids = list(dict.fromkeys(item[0] for rl in ranked_lists for item in rl))
+    item_to_idx = {doc_id: i for i, doc_id in enumerate(ids)}
+
+    idx = np.fromiter((item_to_idx[item[0]] for rl in ranked_lists for item in rl), dtype=np.int64)
+    ranks = np.concatenate([np.arange(1, len(rl) + 1, dtype=np.float64) for rl in ranked_lists if rl])
+    if _rrf_scores_jit is not None:
+        scores = _rrf_scores_jit(idx, ranks, len(ids), float(k))
+    else:
+        scores = np.bincount(idx, weights=1.0 / (k + ranks), minlength=len(ids))
+
+    order = np.argsort(-scores, kind="stable")
+    return list(zip([ids[i] for i in order], scores[order].tolist()))
+
+
+def _rrf_fuse_py(ranked_lists: List[List[Tuple[Any, float, str]]], k: int = 60) -> List[Tuple[Any, float]]:
     scores = {}
     for rl in ranked_lists:
         for rank, item in enumerate(rl, start=1):
@@ -0,0 +1,49 @@
+"""
+Hashing-trick sparse vectors for the `text_sparse` BM25 field.
+
+Tokens are mapped into a fixed 2^20 index space with MurmurHash3, so there is no
+vocabulary to build, grow or lock, and every loader process maps a token to the
+same index. Hash collisions simply add up.
+"""
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+import re
+
+import mmh3
+import numpy as np
+
+SPARSE_DIM = 1 << 20
+
+# Relative weight of each document field in a sparse vector
+FIELD_WEIGHTS = {"summary": 2.0, "text": 1.0}
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    # simple word tokenizer; lowercase and keep word chars
+    return _TOKEN_RE.findall(text.lower())
+
+
+def token_indices(tokens: Iterable[str], dim: int = SPARSE_DIM) -> np.ndarray:
+    return np.fromiter((mmh3.hash(t, signed=False) % dim for t in tokens), dtype=np.int64)
+
+
+def to_sparse(indices: np.ndarray, weights: np.ndarray) -> Optional[Dict[int, float]]:
+    """Sum `weights` per index into an {index: weight} dict; None when nothing is left."""
+    if not len(indices):
+        return None
+    uniq, inverse = np.unique(indices, return_inverse=True)
+    summed = np.bincount(inverse, weights=weights)
+    keep = summed != 0
+    if not keep.any():
+        return None
+    return dict(zip(uniq[keep].tolist(), summed[keep].tolist()))
+
+
+def build_sparse(text: str, dim: int = SPARSE_DIM) -> Dict[int, float]:
+    """Term-count sparse vector of `text`."""
+    counts = Counter(tokenize(text))
+    weights = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+    return to_sparse(token_indices(counts, dim), weights) or {}
+
@@ -5,10 +5,9 @@ Start script for the RAG Graph Search Service v2
 
 import os
 import sys
-import argparse
-from deploy_search_v2 import create_app
 import uvicorn
 import logging
+from types import SimpleNamespace
 
 # Configure logging
 logging.basicConfig(
@@ -17,30 +16,129 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def main():
+# Workers import the app themselves so the parent process only parses args
+APP_FACTORY = "deploy_search_v2:create_app"
+
+# libuv event loop + C HTTP parser; uvloop has no Windows build
+USE_UVLOOP = sys.platform != "win32"
+
+
+def install_event_loop():
+    if not USE_UVLOOP:
+        return
+    # Imported unguarded on purpose: silently falling back to the asyncio loop
+    # would hide a broken install behind a large throughput drop
+    import uvloop
+    uvloop.install()
+
+
+def default_workers() -> int:
+    if os.getenv("WORKERS"):
+        return int(os.getenv("WORKERS"))
+    # Each worker loads its own models and the searches are CPU-bound, so more
+    # workers than cores only adds memory
+    return os.cpu_count() or 1
+
+
+def default_torch_threads(workers: int) -> int:
+    return max(1, (os.cpu_count() or 1) // max(1, workers))
+
+
+def run_gunicorn(args):
+    """Run under Gunicorn with Uvicorn workers (production process management)."""
+    from gunicorn.app.base import BaseApplication
+
+    class SearchApplication(BaseApplication):
+        def load_config(self):
+            options = {
+                "bind": f"{args.host}:{args.port}",
+                "workers": args.workers,
+                # UvicornWorker uses uvloop + httptools when they are installed
+                "worker_class": "uvicorn.workers.UvicornWorker",
+                "loglevel": args.log_level,
+                # Import the app once in the master; workers fork from it
+                "preload_app": True,
+            }
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from deploy_search_v2 import create_app
+            return create_app()
+
+    SearchApplication().run()
+
+
+def env_args() -> SimpleNamespace:
+    """Configuration from environment variables only; also the CLI defaults."""
+    return SimpleNamespace(
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", 8000)),
+        reload=os.getenv("RELOAD", "false").lower() == "true",
+        workers=default_workers(),
+        log_level=os.getenv("LOG_LEVEL", "info"),
+        warmup=os.getenv("WARMUP", "true").lower() == "true",
+        profile=bool(os.getenv("PROFILE_DIR")),
+        profile_dir=os.getenv("PROFILE_DIR", "profiles"),
+        server=os.getenv("SERVER", "uvicorn"),
+    )
+
+
+def build_parser(defaults: SimpleNamespace):
+    # argparse is imported only when there are CLI flags to parse
+    import argparse
     parser = argparse.ArgumentParser(description="Start RAG Graph Search Service v2")
-    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"), help="Host to bind to")
-    parser.add_argument("--port", type=int, default=os.getenv("PORT", 8000), help="Port to bind to")
-    parser.add_argument("--reload", action="store_true", default=(os.getenv("RELOAD", "false").lower() == "true"), 
+    parser.add_argument("--host", default=defaults.host, help="Host to bind to")
+    parser.add_argument("--port", type=int, default=defaults.port, help="Port to bind to")
+    parser.add_argument("--reload", action="store_true", default=defaults.reload, 
                        help="Enable auto-reload (development)")
-    parser.add_argument("--workers", type=int, default=int(os.getenv("WORKERS", 1)), help="Number of worker processes")
-    parser.add_argument("--log-level", default=os.getenv("LOG_LEVEL", "info"), help="Logging level")
-    
-    args = parser.parse_args()
+    parser.add_argument("--workers", type=int, default=defaults.workers, help="Number of worker processes")
+    parser.add_argument("--log-level", default=defaults.log_level, help="Logging level")
+    parser.add_argument("--warmup", action=argparse.BooleanOptionalAction, default=defaults.warmup,
+                       help="Warm up model, Milvus and JIT kernels in each worker before it serves requests")
+    parser.add_argument("--profile", action="store_true", default=defaults.profile,
+                       help="Profile each worker; SIGUSR2 writes <profile-dir>/worker-<pid>.pstats")
+    parser.add_argument("--profile-dir", default=defaults.profile_dir,
+                       help="Directory for per-worker profiles")
+    parser.add_argument("--server", choices=["uvicorn", "gunicorn"], default=defaults.server,
+                       help="Process manager: uvicorn (default) or gunicorn with Uvicorn workers")
+    return parser
+
+
+def main():
+    # Containers usually configure everything through env vars: skip argparse then
+    args = env_args()
+    if len(sys.argv) > 1:
+        args = build_parser(args).parse_args()
+    # Workers read this in the app lifespan, which completes before they accept connections
+    os.environ["WARMUP"] = "true" if args.warmup else "false"
+    if args.profile:
+        os.environ["PROFILE_DIR"] = os.path.abspath(args.profile_dir)
+    # Split the cores between the workers' torch intra-op pools instead of letting
+    # every worker use all of them
+    os.environ.setdefault("TORCH_NUM_THREADS", str(default_torch_threads(args.workers)))
     
     logger.info(f"Starting RAG Graph Search Service v2 on {args.host}:{args.port}")
-    logger.info(f"Configuration: reload={args.reload}, workers={args.workers}, log_level={args.log_level}")
+    logger.info(f"Configuration: server={args.server}, reload={args.reload}, workers={args.workers}, warmup={args.warmup}, log_level={args.log_level}")
     
-    app = create_app()
+    install_event_loop()
     
     try:
+        if args.server == "gunicorn":
+            run_gunicorn(args)
+            return
+        # uvicorn only honours workers/reload when given an import string
         uvicorn.run(
-            app,
+            APP_FACTORY,
+            factory=True,
             host=args.host,
             port=args.port,
             reload=args.reload,
             log_level=args.log_level,
-            workers=args.workers
+            workers=args.workers,
+            loop="uvloop" if USE_UVLOOP else "asyncio",
+            http="httptools",
+            interface="asgi3"
         )
     except KeyboardInterrupt:
         logger.info("Received interrupt signal, shutting down...")
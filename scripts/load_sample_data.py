@@ -1,16 +1,95 @@
 """Simple loader: creates collection in Milvus, inserts sample docs, and builds simple KG."""
-from backend.app.services.milvus_service import MilvusService
+import argparse
+import hashlib
+import inspect
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import islice
+from typing import List
+
+import numpy as np
+
+from backend.app.services import sparse_vector
+from backend.app.services.milvus_service import get_service
 from backend.app.services.kg_service import KGService
 from data.sample_data import SAMPLE_DOCS
+from backend.app.profiling import profiled, reexec_under_py_spy
+
+BATCH_SIZE = 128
+# Below this many docs the process pool's startup cost outweighs the parallelism
+PARALLEL_KG_MIN_DOCS = 5000
+TOKEN_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "data", ".cache")
+
+
+def batched(iterable, n):
+    """Yield successive lists of up to `n` items from `iterable`."""
+    it = iter(iterable)
+    while chunk := list(islice(it, n)):
+        yield chunk
+
+def tokens_cached(docs) -> List[List[str]]:
+    """BM25 tokens of each doc text, cached on disk.
+
+    The key hashes the docs and the tokenizer module's source, so editing either
+    invalidates the cache.
+    """
+    h = hashlib.blake2b()
+    h.update(repr(docs).encode())
+    h.update(inspect.getsource(sparse_vector).encode())
+    path = os.path.join(TOKEN_CACHE_DIR, f"{h.hexdigest()[:16]}.npz")
+    if os.path.exists(path):
+        with np.load(path) as cached:
+            flat, offsets = cached["tokens"].tolist(), cached["offsets"].tolist()
+        return [flat[start:end] for start, end in zip(offsets, offsets[1:])]
+
+    token_lists = [sparse_vector.tokenize(d.get("text", "")) for d in docs]
+    # Flat token array + row offsets, the same layout as a CSR matrix
+    offsets = np.cumsum([0] + [len(t) for t in token_lists])
+    flat = np.array([t for tokens in token_lists for t in tokens], dtype=str)
+    os.makedirs(TOKEN_CACHE_DIR, exist_ok=True)
+    np.savez(path, tokens=flat, offsets=offsets)
+    return token_lists
+
+def build_kg(docs) -> KGService:
+    """Build per-shard subgraphs in worker processes and merge them into one KG."""
+    kg = KGService()
+    workers = min(os.cpu_count() or 1, len(docs))
+    if workers <= 1 or len(docs) < PARALLEL_KG_MIN_DOCS:
+        kg.add_subgraphs([KGService.build_subgraph(docs)])
+        return kg
+    shard_size = -(-len(docs) // workers)
+    shards = list(batched(docs, shard_size))
+    subgraphs = []
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        futures = [ex.submit(KGService.build_subgraph, shard) for shard in shards]
+        for i, fut in enumerate(as_completed(futures), start=1):
+            subgraphs.append(fut.result())
+            print(f"  subgraph {i}/{len(futures)} built")
+    kg.add_subgraphs(subgraphs)
+    return kg
 
 def main():
-    m = MilvusService()
+    m = get_service()
     m.create_collection()
     print("Inserting sample documents into Milvus...")
-    m.insert_documents(SAMPLE_DOCS)
+    # One insert (and one embedding pass) per chunk instead of per document
+    # Tokens come from the on-disk cache after the first run
+    tokens = tokens_cached(SAMPLE_DOCS)
+    for chunk, chunk_tokens in zip(batched(SAMPLE_DOCS, BATCH_SIZE), batched(tokens, BATCH_SIZE)):
+        m.insert_documents(chunk, batch_size=BATCH_SIZE, tokens=chunk_tokens, flush=False)
+    # Seal and re-load once for the whole load instead of once per batch
+    m.flush()
     print("Building KG... (in-memory)")
-    kg = KGService()
+    kg = build_kg(SAMPLE_DOCS)
+    print(f"KG has {kg.G.number_of_nodes()} nodes, {kg.G.number_of_edges()} edges")
     print("Done. Sample data loaded.")
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description="Load sample data into Milvus and the KG")
+    parser.add_argument("--profile", action="store_true", help="Write cProfile stats to load.pstats")
+    parser.add_argument("--py-spy", action="store_true", help="Re-run under py-spy and write load.svg")
+    args = parser.parse_args()
+    if args.py_spy:
+        reexec_under_py_spy("load.svg")
+    with profiled("load.pstats" if args.profile else None):
+        main()
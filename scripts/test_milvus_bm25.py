@@ -5,14 +5,44 @@ This script will:
 - create the collection via `MilvusService`
 - insert a few sample documents
 - run a full-text search and a semantic search
+- repeat both searches and check they are served from the result cache
+- score the queries against the local BM25 matrix with the selected top-k backend
+- send concurrent queries through the batched search engine
+- stream semantic hits as they arrive
+- score several semantic queries with one batched matmul
 
 Requires a running Milvus server accessible at the host/port used below.
 """
-from backend.app.services.milvus_service import MilvusService
+import argparse
+import asyncio
+import sys
 
+import orjson
+from backend.app.profiling import profiled, reexec_under_py_spy
+from backend.app.services.milvus_service import get_service
+from backend.app.services.bm25_numba import BACKENDS, topk_2d
 
-def main():
-    svc = MilvusService(host="127.0.0.1", port="19530")
+
+def _dump(obj):
+    # orjson is far cheaper than print/repr for large hit lists; flush the text
+    # layer first so output stays in order with the print() calls.
+    sys.stdout.flush()
+    sys.stdout.buffer.write(orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE))
+    sys.stdout.buffer.flush()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Milvus BM25 integration test")
+    parser.add_argument("--backend_selection", choices=BACKENDS, default="auto",
+                        help="Top-k backend for local BM25 scoring")
+    parser.add_argument("--profile", action="store_true", help="Write cProfile stats to test_milvus_bm25.pstats")
+    parser.add_argument("--py-spy", action="store_true", help="Re-run under py-spy and write test_milvus_bm25.svg")
+    return parser.parse_args()
+
+
+async def main(args):
+    svc = get_service(host="127.0.0.1", port="19530")
+    svc.topk_backend = args.backend_selection
     svc.create_collection()
 
     docs = [
@@ -22,22 +52,89 @@ def main():
     ]
 
     print("Inserting sample documents...")
-    svc.insert_documents(docs)
+    # Single batched insert: all docs are embedded and BM25-encoded together
+    svc.insert_documents(docs, batch_size=128)
+
+    # The two searches are independent RPCs; run them concurrently
+    loop = asyncio.get_running_loop()
+
+    async def run_searches():
+        return await asyncio.gather(
+            loop.run_in_executor(None, svc.search_fulltext, "quick fox", 5),
+            loop.run_in_executor(None, svc.search_semantic, "programming language", 5),
+            return_exceptions=True,
+        )
+
+    res, res2 = await run_searches()
 
     print("Fulltext search for 'quick fox':")
+    if isinstance(res, Exception):
+        print("Fulltext search failed:", res)
+    else:
+        _dump(res)
+
+    print("Semantic search for 'programming language':")
+    if isinstance(res2, Exception):
+        print("Semantic search failed:", res2)
+    else:
+        _dump(res2)
+
+    # Identical queries again: both should be answered from the cache
+    hits_before = svc.cache_stats()["hits"]
+    await run_searches()
+    stats = svc.cache_stats()
+    print("Cache stats:", stats)
+    if not isinstance(res, Exception) and not isinstance(res2, Exception):
+        assert stats["hits"] - hits_before == 2, "repeated searches were not served from the cache"
+
+    queries = ["quick fox", "programming language"]
+    print(f"Local BM25 top-2 ({args.backend_selection}):")
     try:
-        res = svc.search_fulltext("quick fox", topk=5)
-        print(res)
+        svc.load_local_index()
+        scores = svc.get_scores_batched(queries)
+        top = topk_2d(scores, 2, backend=args.backend_selection)
+        for q, row, idx in zip(queries, scores, top):
+            print(q, [(int(svc._bm25_doc_ids[i]), float(row[i])) for i in idx])
     except Exception as e:
-        print("Fulltext search failed:", e)
+        print("Local BM25 scoring failed:", e)
 
-    print("Semantic search for 'programming language':")
+    # Concurrent single-query submissions are coalesced by the engine: the two
+    # full-text queries share one RPC, as do the two semantic ones
+    engine = svc.batch_engine()
+    batched = await asyncio.gather(
+        asyncio.wrap_future(engine.search_fulltext("quick fox", 5)),
+        asyncio.wrap_future(engine.search_fulltext("lazy dog", 5)),
+        asyncio.wrap_future(engine.search_semantic("programming language", 5)),
+        asyncio.wrap_future(engine.search_semantic("animals playing", 5)),
+        return_exceptions=True,
+    )
+    print("Batched engine results:")
+    for r in batched:
+        if isinstance(r, Exception):
+            print("Batched search failed:", r)
+        else:
+            _dump(r)
+
+    print("Streaming semantic search for 'programming language':")
+    try:
+        async for row in svc.stream_semantic("programming language", 5):
+            _dump(row)
+    except Exception as e:
+        print("Streaming semantic search failed:", e)
+
+    print("Batched semantic search:")
+    svc.use_local_index = True
     try:
-        res2 = svc.search_semantic("programming language", topk=5)
-        print(res2)
+        for q, hits in zip(queries, svc.search_semantic_batch(queries, topk=5)):
+            print(q)
+            _dump(hits)
     except Exception as e:
-        print("Semantic search failed:", e)
+        print("Batched semantic search failed:", e)
 
 
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    if args.py_spy:
+        reexec_under_py_spy("test_milvus_bm25.svg")
+    with profiled("test_milvus_bm25.pstats" if args.profile else None):
+        asyncio.run(main(args))
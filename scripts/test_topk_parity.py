@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""Check that the NumPy and Numba top-k backends select the same documents.
+
+Runs tied and random score arrays through `topk_1d` / `topk_2d` with both
+backends. Works as a plain script or under pytest; needs numba installed.
+"""
+import numpy as np
+
+from backend.app.services.bm25_numba import topk_1d, topk_2d
+
+
+def _cases():
+    rng = np.random.default_rng(0)
+    # Ties straddling the k-th position
+    yield np.array([1.0, 3.0, 2.0, 2.0, 2.0, 0.0, 2.0]), 3
+    yield np.zeros(10), 4
+    yield np.array([5.0, 1.0, 1.0, 1.0, 5.0, 1.0]), 3
+    # Random scores, with and without heavy ties
+    for n, k in ((1, 1), (50, 5), (1000, 10), (1000, 1000)):
+        yield rng.random(n), k
+        yield rng.integers(0, 4, n).astype(np.float64), k
+
+
+def test_topk_1d_parity():
+    for scores, k in _cases():
+        np.testing.assert_array_equal(topk_1d(scores, k, backend="numpy"), topk_1d(scores, k, backend="numba"))
+
+
+def test_topk_1d_ties_by_position():
+    scores = np.array([1.0, 3.0, 2.0, 2.0, 2.0, 0.0, 2.0])
+    for backend in ("numpy", "numba"):
+        assert topk_1d(scores, 3, backend=backend).tolist() == [1, 2, 3]
+
+
+def test_topk_2d_parity():
+    rng = np.random.default_rng(1)
+    for scores in (rng.integers(0, 3, (8, 200)).astype(np.float64), rng.random((8, 200))):
+        for k in (1, 7, 200):
+            np.testing.assert_array_equal(topk_2d(scores, k, backend="numpy"), topk_2d(scores, k, backend="numba"))
+
+
+if __name__ == "__main__":
+    test_topk_1d_parity()
+    test_topk_1d_ties_by_position()
+    test_topk_2d_parity()
+    print("numpy and numba top-k backends agree")